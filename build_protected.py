@@ -3,12 +3,28 @@
 Master build script for creating protected Python backend
 """
 
+import asyncio
 import os
 import sys
 import subprocess
 import shutil
+from collections import deque
 from pathlib import Path
 
+# Lines of build output kept for error reporting
+OUTPUT_TAIL_LINES = 200
+
+# Bytes read from a build's output per await
+STREAM_READ_SIZE = 64 * 1024
+
+# Output markers for failures that every build would hit (missing tools/modules)
+FATAL_BUILD_MARKERS = ("ModuleNotFoundError", "No module named", "command not found")
+
+_YES = frozenset({"y", "yes"})
+
+REPO_ROOT = Path(__file__).resolve().parent
+BACKEND_DIR = REPO_ROOT / "python_backend"
+
 def print_banner():
     """Print build banner"""
     print("=" * 60)
@@ -19,113 +35,269 @@ def print_banner():
 def show_menu():
     """Show build options menu"""
     print("Choose protection method:")
-    print("1. PyInstaller (Good protection, single executable)")
+    print("1. PyInstaller (Good protection, standalone bundle)")
     print("2. Nuitka (Maximum protection, native compilation)")
     print("3. Encrypted Bytecode (Good protection, requires Python runtime)")
     print("4. All methods (Build all three approaches)")
     print("5. Exit")
     print()
 
-def build_pyinstaller():
-    """Build using PyInstaller"""
-    print("[BUILD] Building with PyInstaller...")
+class FatalBuildError(Exception):
+    """A build failed in a way the remaining builds would hit as well"""
+
+def _is_fatal(output):
+    """Check build output for failures that make the other builds pointless"""
+    return any(marker in output for marker in FATAL_BUILD_MARKERS)
+
+async def _run_streaming(cmd, cwd, label):
+    """Run a command, echoing its output live; return (returncode, last output lines)"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    # Keep only the tail for the failure message so memory stays bounded
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    
+    def emit(raw):
+        line = raw.decode(errors="replace")
+        tail.append(line)
+        sys.stdout.write(f"  [{label}] {line}")
+        sys.stdout.flush()
+    
+    # Read fixed-size blocks and split lines here: line iteration on the stream
+    # raises ValueError on lines over 64 KiB, which long module lists exceed
+    pending = bytearray()
     try:
-        os.chdir("python_backend")
-        result = subprocess.run([sys.executable, "build_executable.py"], 
-                              capture_output=True, text=True)
-        os.chdir("..")
+        while True:
+            block = await proc.stdout.read(STREAM_READ_SIZE)
+            if not block:
+                break
+            pending += block
+            cut = pending.rfind(b"\n") + 1
+            if cut:
+                for raw in bytes(pending[:cut]).split(b"\n")[:-1]:
+                    emit(raw + b"\n")
+                del pending[:cut]
+        if pending:
+            emit(bytes(pending) + b"\n")
+        await proc.wait()
+    finally:
+        # Cancelled by a sibling's fatal error or failed mid-stream: don't leave
+        # the compiler running
+        if proc.returncode is None:
+            proc.terminate()
+            await proc.wait()
+    return proc.returncode, "".join(tail)
+
+async def _build_backend(title, script_name, label):
+    """Run one python_backend build script; raise FatalBuildError on fatal failure"""
+    try:
+        returncode, output = await _run_streaming([sys.executable, script_name], BACKEND_DIR, label)
         
-        if result.returncode == 0:
-            print("[SUCCESS] PyInstaller build completed!")
+        if returncode == 0:
+            print(f"[SUCCESS] {title} build completed!")
             return True
         else:
-            print(f"[ERROR] PyInstaller build failed: {result.stderr}")
+            print(f"[ERROR] {title} build failed:\n{output}")
+            if _is_fatal(output):
+                raise FatalBuildError(title)
             return False
+    except FatalBuildError:
+        raise
     except Exception as e:
-        print(f"[ERROR] PyInstaller build error: {e}")
+        print(f"[ERROR] {title} build error: {e}")
         return False
 
-def build_nuitka():
+async def build_pyinstaller_async():
+    """Build using PyInstaller"""
+    print("[BUILD] Building with PyInstaller...")
+    return await _build_backend("PyInstaller", "build_executable.py", "pyinstaller")
+
+async def build_nuitka_async():
     """Build using Nuitka"""
     print("[BUILD] Building with Nuitka...")
-    try:
-        os.chdir("python_backend")
-        result = subprocess.run([sys.executable, "build_nuitka.py"], 
-                              capture_output=True, text=True)
-        os.chdir("..")
-        
-        if result.returncode == 0:
-            print("[SUCCESS] Nuitka build completed!")
-            return True
-        else:
-            print(f"[ERROR] Nuitka build failed: {result.stderr}")
-            return False
-    except Exception as e:
-        print(f"[ERROR] Nuitka build error: {e}")
-        return False
+    return await _build_backend("Nuitka", "build_nuitka.py", "nuitka")
 
-def build_encrypted():
+async def build_encrypted_async():
     """Build encrypted bytecode"""
     print("[BUILD] Building encrypted bytecode...")
+    return await _build_backend("Encrypted bytecode", "encrypt_bytecode.py", "encrypted")
+
+def _run_single_build(coro):
+    """Run one build from the synchronous menu; a fatal failure is just a failure"""
     try:
-        os.chdir("python_backend")
-        result = subprocess.run([sys.executable, "encrypt_bytecode.py"], 
-                              capture_output=True, text=True)
-        os.chdir("..")
-        
-        if result.returncode == 0:
-            print("[SUCCESS] Encrypted bytecode build completed!")
-            return True
-        else:
-            print(f"[ERROR] Encrypted bytecode build failed: {result.stderr}")
-            return False
-    except Exception as e:
-        print(f"[ERROR] Encrypted bytecode build error: {e}")
+        return asyncio.run(coro)
+    except FatalBuildError:
         return False
 
+def build_pyinstaller():
+    """Build using PyInstaller"""
+    return _run_single_build(build_pyinstaller_async())
+
+def build_nuitka():
+    """Build using Nuitka"""
+    return _run_single_build(build_nuitka_async())
+
+def build_encrypted():
+    """Build encrypted bytecode"""
+    return _run_single_build(build_encrypted_async())
+
+async def _build_bundles_in_turn():
+    """PyInstaller, then Nuitka; return the success count.
+    
+    Both write python_backend/dist/processor/ and PyInstaller deletes build/
+    and __pycache__ when done, so running them together would wreck each
+    other's output. Nuitka's bundle replaces PyInstaller's."""
+    succeeded = await build_pyinstaller_async()
+    return succeeded + await build_nuitka_async()
+
+async def build_all():
+    """Run the protection builds, encrypted bytecode alongside the two bundle
+    builds; return the success count"""
+    tasks = [
+        asyncio.create_task(_build_bundles_in_turn()),
+        asyncio.create_task(build_encrypted_async()),
+    ]
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    
+    # A fatal failure (e.g. missing module) will sink the other builds too: stop them now
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    
+    fatal = [t.exception() for t in done if t.exception() is not None]
+    if fatal:
+        print(f"[ERROR] {fatal[0]} build hit a fatal error; cancelled {len(pending)} remaining build(s)")
+    return sum(t.result() for t in done if t.exception() is None)
+
 def build_electron():
     """Build Electron app with protected backend"""
     print("[BUILD] Building Electron app...")
     try:
-        result = subprocess.run(["npm", "run", "build:win"], 
-                              capture_output=True, text=True)
+        npm = shutil.which("npm") or "npm"
+        returncode, output = asyncio.run(
+            _run_streaming([npm, "run", "build:win"], REPO_ROOT, "electron")
+        )
         
-        if result.returncode == 0:
+        if returncode == 0:
             print("[SUCCESS] Electron app build completed!")
             return True
         else:
-            print(f"[ERROR] Electron app build failed: {result.stderr}")
+            print(f"[ERROR] Electron app build failed:\n{output}")
             return False
     except Exception as e:
         print(f"[ERROR] Electron app build error: {e}")
         return False
 
+def _fast_rmtree(path):
+    """Remove a directory tree using the platform's native rm, falling back to shutil"""
+    if os.name == "nt":
+        cmd = ["cmd", "/c", "rd", "/s", "/q", str(path)] if shutil.which("cmd") else None
+    else:
+        cmd = ["rm", "-rf", str(path)] if shutil.which("rm") else None
+    # Only fall back when the native tool is missing or reports failure
+    if cmd is None or subprocess.run(cmd, check=False).returncode != 0:
+        shutil.rmtree(path, ignore_errors=True)
+
+def _purge_pycache(root):
+    """Remove every __pycache__ directory below root; return the removed paths"""
+    removed = []
+    try:
+        with os.scandir(root) as it:
+            subdirs = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return removed
+    for entry in subdirs:
+        if entry.name == "__pycache__":
+            _fast_rmtree(entry.path)
+            removed.append(entry.path)
+        else:
+            removed.extend(_purge_pycache(entry.path))
+    return removed
+
 def cleanup_build_files():
     """Clean up temporary build files"""
     print("[CLEANUP] Cleaning up build files...")
     
-    cleanup_dirs = [
-        "python_backend/build",
-        "python_backend/__pycache__",
-        "python_backend/dist"
-    ]
+    cleanup_dirs = ["build", "dist"]
     
     cleanup_files = [
-        "python_backend/processor.spec",
-        "python_backend/processor_encrypted.py",
-        "python_backend/processor_encrypted.bin",
-        "python_backend/encryption.key"
+        "processor.spec",
+        "processor_encrypted.py",
+        "processor_encrypted.bin",
+        "encryption.key"
     ]
     
-    for dir_path in cleanup_dirs:
-        if os.path.exists(dir_path):
-            shutil.rmtree(dir_path)
-            print(f"  Removed {dir_path}/")
+    # One directory listing instead of a stat() per candidate path
+    try:
+        with os.scandir(BACKEND_DIR) as it:
+            entries = {entry.name for entry in it}
+    except OSError:
+        return
+    
+    for name in cleanup_dirs:
+        if name in entries:
+            _fast_rmtree(BACKEND_DIR / name)
+            print(f"  Removed python_backend/{name}/")
+    
+    # Subpackages (detectors, tests, ...) get their own bytecode caches
+    for path in _purge_pycache(BACKEND_DIR):
+        print(f"  Removed {Path(path).relative_to(REPO_ROOT).as_posix()}/")
+    
+    for name in cleanup_files:
+        if name in entries:
+            try:
+                os.remove(BACKEND_DIR / name)
+                print(f"  Removed python_backend/{name}")
+            except FileNotFoundError:
+                pass
+
+def _menu_pyinstaller():
+    """Menu option 1"""
+    if build_pyinstaller():
+        print("\n[SUCCESS] PyInstaller build completed!")
+        print("[INFO] Executable: python_backend/dist/processor/processor.exe")
+        print("[TIP] This executable is obfuscated and standalone")
+
+def _menu_nuitka():
+    """Menu option 2"""
+    if build_nuitka():
+        print("\n[SUCCESS] Nuitka build completed!")
+        print("[INFO] Executable: python_backend/dist/processor/processor.exe")
+        print("[TIP] This executable is compiled to native code")
+
+def _menu_encrypted():
+    """Menu option 3"""
+    if build_encrypted():
+        print("\n[SUCCESS] Encrypted bytecode build completed!")
+        print("[INFO] Files: processor_encrypted.py, processor_encrypted.bin, encryption.key")
+        print("[TIP] This approach requires Python runtime but code is encrypted")
+
+def _menu_all():
+    """Menu option 4"""
+    print("[BUILD] Building all protection methods...")
+    success_count = asyncio.run(build_all())
     
-    for file_path in cleanup_files:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            print(f"  Removed {file_path}")
+    print(f"\n[SUCCESS] Built {success_count}/3 protection methods")
+
+def _menu_exit():
+    """Menu option 5"""
+    print("[EXIT] Goodbye!")
+    sys.exit(0)
+
+MENU_ACTIONS = {
+    "1": _menu_pyinstaller,
+    "2": _menu_nuitka,
+    "3": _menu_encrypted,
+    "4": _menu_all,
+    "5": _menu_exit,
+}
+
+def _confirm(prompt):
+    """Ask a y/n question"""
+    return input(prompt).strip().lower() in _YES
 
 def main():
     """Main build process"""
@@ -135,52 +307,16 @@ def main():
         show_menu()
         choice = input("Enter your choice (1-5): ").strip()
         
-        if choice == "1":
-            if build_pyinstaller():
-                print("\n[SUCCESS] PyInstaller build completed!")
-                print("[INFO] Executable: python_backend/dist/processor.exe")
-                print("[TIP] This executable is obfuscated and standalone")
-            break
-            
-        elif choice == "2":
-            if build_nuitka():
-                print("\n[SUCCESS] Nuitka build completed!")
-                print("[INFO] Executable: python_backend/dist/processor.exe")
-                print("[TIP] This executable is compiled to native code")
-            break
-            
-        elif choice == "3":
-            if build_encrypted():
-                print("\n[SUCCESS] Encrypted bytecode build completed!")
-                print("[INFO] Files: processor_encrypted.py, processor_encrypted.bin, encryption.key")
-                print("[TIP] This approach requires Python runtime but code is encrypted")
-            break
-            
-        elif choice == "4":
-            print("[BUILD] Building all protection methods...")
-            success_count = 0
-            
-            if build_pyinstaller():
-                success_count += 1
-            if build_nuitka():
-                success_count += 1
-            if build_encrypted():
-                success_count += 1
-                
-            print(f"\n[SUCCESS] Built {success_count}/3 protection methods")
-            break
-            
-        elif choice == "5":
-            print("[EXIT] Goodbye!")
-            sys.exit(0)
-            
-        else:
+        action = MENU_ACTIONS.get(choice)
+        if action is None:
             print("[ERROR] Invalid choice. Please enter 1-5.")
             print()
+            continue
+        action()
+        break
     
     # Ask if user wants to build Electron app
-    build_electron_choice = input("\n[BUILD] Build Electron app with protected backend? (y/n): ").strip().lower()
-    if build_electron_choice in ['y', 'yes']:
+    if _confirm("\n[BUILD] Build Electron app with protected backend? (y/n): "):
         if build_electron():
             print("\n[SUCCESS] Complete build finished!")
             print("[INFO] Check the 'dist' folder for your protected app")
@@ -188,8 +324,7 @@ def main():
             print("\n[ERROR] Electron build failed")
     
     # Ask if user wants to clean up
-    cleanup_choice = input("\n[CLEANUP] Clean up temporary build files? (y/n): ").strip().lower()
-    if cleanup_choice in ['y', 'yes']:
+    if _confirm("\n[CLEANUP] Clean up temporary build files? (y/n): "):
         cleanup_build_files()
     
     print("\n[SUCCESS] Build process completed!")
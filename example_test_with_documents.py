@@ -4,8 +4,9 @@ Example of how to use generated test documents with existing unit tests.
 """
 
 import os
+import re
 import sys
-import tempfile
+from itertools import islice
 from pathlib import Path
 
 # Add the repository root to the path
@@ -16,21 +17,39 @@ if str(repo_root) not in sys.path:
 from python_backend.test_document_generator import TestDocumentGenerator, OutputEstimator
 from python_backend.processor import process_text_file
 
-def example_basic_test():
+# Patterns used to spot sensitive data that survived masking
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+SSN_RE = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
+CREDIT_CARD_RE = re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b')
+IPV4_RE = re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b')
+
+
+def _count_matches(pattern, text):
+    """Count pattern matches without building the list of matches."""
+    return sum(1 for _ in pattern.finditer(text))
+
+def _set_common_environment():
+    """Set the templating and key variables shared by every example."""
+    os.environ["DOCMASK_USE_DEFAULT_TEMPLATES"] = "true"
+    os.environ["DOC_MASKING_ENV_KEY"] = "test_env_key"
+    os.environ["DOC_MASKING_DOC_KEY"] = "test_doc_key"
+
+def _generate_documents_by_name():
+    """Generate the test corpus once and index it by document name."""
+    generator = TestDocumentGenerator()
+    return {doc.name: doc for doc in generator.generate_test_documents()}
+
+def example_basic_test(docs_by_name=None):
     """Example of using generated documents in a basic test."""
     print("Example: Basic Test with Generated Document")
     print("=" * 50)
     
-    # Generate a test document
-    generator = TestDocumentGenerator()
-    documents = generator.generate_test_documents()
+    if docs_by_name is None:
+        docs_by_name = _generate_documents_by_name()
     
     # Find the basic email test document
-    test_doc = None
-    for doc in documents:
-        if doc.name == "basic_email_test":
-            test_doc = doc
-            break
+    test_doc = docs_by_name.get("basic_email_test")
     
     if not test_doc:
         print("Test document not found!")
@@ -40,27 +59,24 @@ def example_basic_test():
     print(test_doc.content)
     print("\n" + "-" * 50)
     
+    import tempfile
+    
     # Process the document
     with tempfile.TemporaryDirectory() as temp_dir:
-        input_path = os.path.join(temp_dir, "input.txt")
-        output_path = os.path.join(temp_dir, "output.txt")
+        input_path = Path(temp_dir) / "input.txt"
+        output_path = Path(temp_dir) / "output.txt"
         
         # Write test document
-        with open(input_path, 'w', encoding='utf-8') as f:
-            f.write(test_doc.content)
+        input_path.write_text(test_doc.content, encoding='utf-8')
         
-        # Set environment variables for processing
+        # Select the entities for this example
         os.environ["DOCMASK_ENTITY_POLICY"] = '{"entities": ["email", "phone", "person_name"]}'
-        os.environ["DOCMASK_USE_DEFAULT_TEMPLATES"] = "true"
-        os.environ["DOC_MASKING_ENV_KEY"] = "test_env_key"
-        os.environ["DOC_MASKING_DOC_KEY"] = "test_doc_key"
         
         # Process the document
-        result = process_text_file(input_path, output_path)
+        result = process_text_file(str(input_path), str(output_path))
         
         if result["status"] == "success":
-            with open(output_path, 'r', encoding='utf-8') as f:
-                actual_output = f.read()
+            actual_output = output_path.read_text(encoding='utf-8')
             
             print("Processed document:")
             print(actual_output)
@@ -81,22 +97,18 @@ def example_basic_test():
             print(f"Expected length: {len(expected_output)}")
             
             # Check if sensitive data was masked
-            import re
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-            
-            original_emails = re.findall(email_pattern, test_doc.content)
-            processed_emails = re.findall(email_pattern, actual_output)
+            original_emails = _count_matches(EMAIL_RE, test_doc.content)
+            processed_emails = _count_matches(EMAIL_RE, actual_output)
             
-            original_phones = re.findall(phone_pattern, test_doc.content)
-            processed_phones = re.findall(phone_pattern, actual_output)
+            original_phones = _count_matches(PHONE_RE, test_doc.content)
+            processed_phones = _count_matches(PHONE_RE, actual_output)
             
-            print(f"Original emails found: {len(original_emails)}")
-            print(f"Processed emails found: {len(processed_emails)}")
-            print(f"Original phones found: {len(original_phones)}")
-            print(f"Processed phones found: {len(processed_phones)}")
+            print(f"Original emails found: {original_emails}")
+            print(f"Processed emails found: {processed_emails}")
+            print(f"Original phones found: {original_phones}")
+            print(f"Processed phones found: {processed_phones}")
             
-            if len(processed_emails) == 0 and len(processed_phones) == 0:
+            if processed_emails == 0 and processed_phones == 0:
                 print("[SUCCESS] All sensitive data appears to be masked!")
             else:
                 print("[WARNING] Some sensitive data may not be properly masked")
@@ -104,21 +116,16 @@ def example_basic_test():
         else:
             print(f"Processing failed: {result.get('error', 'Unknown error')}")
 
-def example_comprehensive_test():
+def example_comprehensive_test(docs_by_name=None):
     """Example of using a comprehensive test document."""
     print("\n\nExample: Comprehensive Test with Generated Document")
     print("=" * 60)
     
-    # Generate a test document
-    generator = TestDocumentGenerator()
-    documents = generator.generate_test_documents()
+    if docs_by_name is None:
+        docs_by_name = _generate_documents_by_name()
     
     # Find the comprehensive test document
-    test_doc = None
-    for doc in documents:
-        if doc.name == "comprehensive_test":
-            test_doc = doc
-            break
+    test_doc = docs_by_name.get("comprehensive_test")
     
     if not test_doc:
         print("Comprehensive test document not found!")
@@ -129,56 +136,62 @@ def example_comprehensive_test():
     print("\n" + "-" * 50)
     
     # Show expected entities
-    print("Expected entities to be masked:")
-    for i, entity in enumerate(test_doc.expected_entities[:10]):  # Show first 10
+    lines = ["Expected entities to be masked:"]
+    for i, entity in enumerate(islice(test_doc.expected_entities, 10)):  # Show first 10
         entity_text = test_doc.content[entity['start']:entity['end']]
-        print(f"  {i+1}. {entity['type']}: '{entity_text}'")
+        lines.append(f"  {i+1}. {entity['type']}: '{entity_text}'")
     
     if len(test_doc.expected_entities) > 10:
-        print(f"  ... and {len(test_doc.expected_entities) - 10} more entities")
+        lines.append(f"  ... and {len(test_doc.expected_entities) - 10} more entities")
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    import tempfile
     
     # Process the document
     with tempfile.TemporaryDirectory() as temp_dir:
-        input_path = os.path.join(temp_dir, "input.txt")
-        output_path = os.path.join(temp_dir, "output.txt")
+        input_path = Path(temp_dir) / "input.txt"
+        output_path = Path(temp_dir) / "output.txt"
         
         # Write test document
-        with open(input_path, 'w', encoding='utf-8') as f:
-            f.write(test_doc.content)
+        input_path.write_text(test_doc.content, encoding='utf-8')
         
         # Set environment variables for comprehensive processing
         os.environ["DOCMASK_ENTITY_POLICY"] = '{"entities": ["person_name", "email", "phone", "address", "government_id", "financial", "credentials", "ipv4", "mac", "mrn_or_insurance", "icd10", "cpt", "vin", "license_plate", "gps", "organization"]}'
-        os.environ["DOCMASK_USE_DEFAULT_TEMPLATES"] = "true"
-        os.environ["DOC_MASKING_ENV_KEY"] = "test_env_key"
-        os.environ["DOC_MASKING_DOC_KEY"] = "test_doc_key"
         
         # Process the document
-        result = process_text_file(input_path, output_path)
+        result = process_text_file(str(input_path), str(output_path))
         
         if result["status"] == "success":
+            patterns = {
+                "Email": EMAIL_RE,
+                "Phone": PHONE_RE,
+                "SSN": SSN_RE,
+                "Credit Card": CREDIT_CARD_RE,
+                "IP Address": IPV4_RE
+            }
+            
+            # Stream the masked output: keep a short preview and count leaks line by line
+            processed_counts = dict.fromkeys(patterns, 0)
             with open(output_path, 'r', encoding='utf-8') as f:
-                actual_output = f.read()
+                preview = f.read(500)
+                f.seek(0)
+                for line in f:
+                    for pattern_name, pattern in patterns.items():
+                        processed_counts[pattern_name] += _count_matches(pattern, line)
             
             print("\nProcessed document (first 500 chars):")
-            print(actual_output[:500] + "...")
+            print(preview + "...")
             
             # Analyze masking effectiveness
             print("\n" + "-" * 50)
             print("Masking Analysis:")
             
-            import re
-            patterns = {
-                "Email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                "Phone": r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-                "SSN": r'\b\d{3}-\d{2}-\d{4}\b',
-                "Credit Card": r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-                "IP Address": r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'
-            }
-            
+            lines = []
             for pattern_name, pattern in patterns.items():
-                original_count = len(re.findall(pattern, test_doc.content))
-                processed_count = len(re.findall(pattern, actual_output))
-                print(f"  {pattern_name}: {original_count} -> {processed_count} (masked: {original_count - processed_count})")
+                original_count = _count_matches(pattern, test_doc.content)
+                processed_count = processed_counts[pattern_name]
+                lines.append(f"  {pattern_name}: {original_count} -> {processed_count} (masked: {original_count - processed_count})")
+            sys.stdout.write("\n".join(lines) + "\n")
         
         else:
             print(f"Processing failed: {result.get('error', 'Unknown error')}")
@@ -188,11 +201,17 @@ def main():
     print("Doc Masking - Example Tests with Generated Documents")
     print("=" * 60)
     
+    # Environment shared by both examples; each example only sets its policy
+    _set_common_environment()
+    
+    # Generate the test corpus once for both examples
+    docs_by_name = _generate_documents_by_name()
+    
     # Run basic example
-    example_basic_test()
+    example_basic_test(docs_by_name)
     
     # Run comprehensive example
-    example_comprehensive_test()
+    example_comprehensive_test(docs_by_name)
     
     print("\n" + "=" * 60)
     print("Examples completed!")
@@ -8,6 +8,7 @@ to a dedicated directory for easy inspection and comparison.
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the repository root to the path
@@ -16,13 +17,15 @@ if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
 from python_backend.test_document_generator import TestDocumentGenerator, OutputEstimator
-from python_backend.test_runner_with_documents import EnhancedTestRunner
 
 def generate_masked_documents():
     """Generate masked versions of all test documents."""
     print("[SECURE] Doc Masking - Generating Masked Documents")
     print("=" * 50)
     
+    # Deferred so a broken backend import is reported by main()'s error handler
+    from python_backend.test_runner_with_documents import EnhancedTestRunner
+    
     # Create test runner
     runner = EnhancedTestRunner("test_documents")
     
@@ -35,82 +38,96 @@ def generate_masked_documents():
     
     # Generate additional masked documents for inspection
     print("\n3. Creating additional masked documents for inspection...")
-    create_inspection_documents()
+    create_inspection_documents(runner.documents, runner.estimator)
     
     print("\n[SUCCESS] Masked documents generation complete!")
     print(f"\n[INFO] Check out the masked documents in: test_documents/masked_documents/")
     
     return results
 
-def create_inspection_documents():
+def _prepare_docs(documents: list) -> list:
+    """Return (doc, entity_types) pairs for the text documents in one pass."""
+    return [
+        (doc, {e['type'] for e in doc.expected_entities})
+        for doc in documents
+        if doc.document_type == "txt"
+    ]
+
+def create_inspection_documents(documents: list = None, estimator: OutputEstimator = None):
     """Create additional masked documents for easy inspection."""
-    generator = TestDocumentGenerator()
-    estimator = OutputEstimator()
+    if documents is None:
+        documents = TestDocumentGenerator().generate_test_documents()
+    if estimator is None:
+        estimator = OutputEstimator()
     
     # Create inspection directory
     inspection_dir = "test_documents/masked_documents/inspection"
     os.makedirs(inspection_dir, exist_ok=True)
     
-    # Get all test documents
-    documents = generator.generate_test_documents()
-    
-    # Create comparison documents
-    for doc in documents:
-        if doc.document_type == "txt":
-            # Original document
-            original_path = os.path.join(inspection_dir, f"{doc.name}_original.txt")
-            with open(original_path, 'w', encoding='utf-8') as f:
-                f.write(doc.content)
-            
-            # Expected masked output (template-based)
-            expected_masked = estimator.estimate_output(doc, preserve_length=False)
-            expected_path = os.path.join(inspection_dir, f"{doc.name}_expected_masked.txt")
-            with open(expected_path, 'w', encoding='utf-8') as f:
-                f.write(expected_masked)
-            
-            # Length-preserving masked output
-            length_preserving = estimator.estimate_output(doc, preserve_length=True)
-            length_path = os.path.join(inspection_dir, f"{doc.name}_length_preserving.txt")
-            with open(length_path, 'w', encoding='utf-8') as f:
-                f.write(length_preserving)
-            
-            print(f"  [FILE] {doc.name}: original, expected, length-preserving")
+    txt_docs = _prepare_docs(documents)
+    
+    def _emit(doc):
+        """Write the original, expected and length-preserving files for one document."""
+        prefix = f"{inspection_dir}{os.sep}{doc.name}"
+        
+        # Original document
+        Path(f"{prefix}_original.txt").write_text(doc.content, encoding='utf-8')
+        
+        # Expected masked output (template-based)
+        expected_masked = estimator.estimate_output(doc, preserve_length=False)
+        Path(f"{prefix}_expected_masked.txt").write_text(expected_masked, encoding='utf-8')
+        
+        # Length-preserving masked output
+        length_preserving = estimator.estimate_output(doc, preserve_length=True)
+        Path(f"{prefix}_length_preserving.txt").write_text(length_preserving, encoding='utf-8')
+        
+        return doc.name
+    
+    # Create comparison documents; each document is independent, so fan out the I/O
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name in executor.map(_emit, (doc for doc, _ in txt_docs)):
+            print(f"  [FILE] {name}: original, expected, length-preserving")
     
     # Create a summary document
-    create_summary_document(inspection_dir, documents)
+    create_summary_document(inspection_dir, txt_docs)
 
-def create_summary_document(inspection_dir: str, documents: list):
+def create_summary_document(inspection_dir: str, txt_docs: list):
     """Create a summary document with all test cases."""
     summary_path = os.path.join(inspection_dir, "SUMMARY.md")
     
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        f.write("# Masked Documents Summary\n\n")
-        f.write("This directory contains masked versions of all test documents for inspection.\n\n")
-        
-        f.write("## Document Types\n\n")
-        f.write("For each test document, you'll find:\n")
-        f.write("- `{name}_original.txt` - Original document with sensitive data\n")
-        f.write("- `{name}_expected_masked.txt` - Expected masked output (template-based)\n")
-        f.write("- `{name}_length_preserving.txt` - Length-preserving masked output\n\n")
+    parts = [
+        "# Masked Documents Summary\n\n",
+        "This directory contains masked versions of all test documents for inspection.\n\n",
         
-        f.write("## Test Documents\n\n")
-        for doc in documents:
-            if doc.document_type == "txt":
-                f.write(f"### {doc.name}\n")
-                f.write(f"**Description:** {doc.description}\n")
-                f.write(f"**Entity Types:** {', '.join(set(e['type'] for e in doc.expected_entities))}\n")
-                f.write(f"**Expected Entities:** {len(doc.expected_entities)}\n\n")
+        "## Document Types\n\n",
+        "For each test document, you'll find:\n",
+        "- `{name}_original.txt` - Original document with sensitive data\n",
+        "- `{name}_expected_masked.txt` - Expected masked output (template-based)\n",
+        "- `{name}_length_preserving.txt` - Length-preserving masked output\n\n",
         
-        f.write("## How to Use\n\n")
-        f.write("1. Compare `original` vs `expected_masked` to see what should be masked\n")
-        f.write("2. Compare `original` vs `length_preserving` to see length-preserving masking\n")
-        f.write("3. Use these documents to validate your masking implementation\n")
-        f.write("4. Check the actual masked outputs in the parent directory\n\n")
+        "## Test Documents\n\n",
+    ]
+    for doc, entity_types in txt_docs:
+        parts.append(f"### {doc.name}\n")
+        parts.append(f"**Description:** {doc.description}\n")
+        parts.append(f"**Entity Types:** {', '.join(entity_types)}\n")
+        parts.append(f"**Expected Entities:** {len(doc.expected_entities)}\n\n")
+    
+    parts.extend([
+        "## How to Use\n\n",
+        "1. Compare `original` vs `expected_masked` to see what should be masked\n",
+        "2. Compare `original` vs `length_preserving` to see length-preserving masking\n",
+        "3. Use these documents to validate your masking implementation\n",
+        "4. Check the actual masked outputs in the parent directory\n\n",
         
-        f.write("## File Locations\n\n")
-        f.write("- **Test Results:** `../test_results.json`\n")
-        f.write("- **Expected Outputs:** `../test_expectations.json`\n")
-        f.write("- **Actual Masked:** `../` (files ending with `_masked.txt`)\n")
+        "## File Locations\n\n",
+        "- **Test Results:** `../test_results.json`\n",
+        "- **Expected Outputs:** `../test_expectations.json`\n",
+        "- **Actual Masked:** `../` (files ending with `_masked.txt`)\n",
+    ])
+    
+    Path(summary_path).write_text("".join(parts), encoding='utf-8')
     
     print(f"  [SUMMARY] Summary document: {summary_path}")
 
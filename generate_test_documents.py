@@ -13,7 +13,6 @@ if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
 from python_backend.test_document_generator import TestDocumentGenerator, OutputEstimator
-from python_backend.test_runner_with_documents import EnhancedTestRunner
 
 def main():
     """Generate test documents and run tests."""
@@ -58,6 +57,7 @@ def main():
     
     # Run enhanced tests
     print("\n4. Running enhanced tests...")
+    from python_backend.test_runner_with_documents import EnhancedTestRunner
     runner = EnhancedTestRunner("test_documents")
     results = runner.run_all_tests()
     
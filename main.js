@@ -76,13 +76,17 @@ ipcMain.handle('process-document', async (event, { inputPath, outputPath, policy
       ? path.join(process.resourcesPath, 'python_backend')
       : path.join(__dirname, 'python_backend');
 
-    const compiledPath = isWindows
-      ? path.join(backendBase, 'dist', 'processor.exe')
-      : path.join(backendBase, 'dist', 'processor');
+    const exeName = isWindows ? 'processor.exe' : 'processor';
+    // One-folder build (dist/processor/processor[.exe]) first, then a legacy one-file build
+    const compiledCandidates = [
+      path.join(backendBase, 'dist', 'processor', exeName),
+      path.join(backendBase, 'dist', exeName),
+    ];
     const scriptPath = path.join(backendBase, 'processor.py');
 
     const trySpawnCompiled = () => {
-      if (!fs.existsSync(compiledPath)) return null;
+      const compiledPath = compiledCandidates.find((p) => fs.existsSync(p));
+      if (!compiledPath) return null;
       try {
         return spawn(compiledPath, [inputPath, outputPath]);
       } catch (_e) {
@@ -144,7 +148,7 @@ ipcMain.handle('process-document', async (event, { inputPath, outputPath, policy
         resolve({
           status: 'error',
           message: 'Failed to start processor',
-          error: `ENOENT or not executable. Looked for compiled at ${compiledPath} and script at ${scriptPath}`
+          error: `ENOENT or not executable. Looked for compiled at ${compiledCandidates.join(' or ')} and script at ${scriptPath}`
         });
       });
     };
@@ -200,7 +204,7 @@ ipcMain.handle('process-document', async (event, { inputPath, outputPath, policy
     resolve({
       status: 'error',
       message: 'Failed to start processor',
-      error: `No usable processor found. Tried compiled at ${compiledPath} and Python at ${scriptPath}`
+      error: `No usable processor found. Tried compiled at ${compiledCandidates.join(' or ')} and Python at ${scriptPath}`
     });
   });
 });
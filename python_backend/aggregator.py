@@ -1,39 +1,77 @@
-from typing import List, Dict, Any
+from operator import itemgetter
+from typing import Any, Callable, Dict, List
+
+
+_START = itemgetter("start")
+_END = itemgetter("end")
+
+
+def _sort_spans(items: List[Dict[str, Any]]) -> None:
+    # Same order as key=(start, -end): two stable passes with C key functions
+    # instead of building a tuple per entity. Detector outputs arrive as
+    # start-ordered runs, which list.sort already merges run by run; a
+    # heapq.merge over per-detector batches measured ~3x slower.
+    items.sort(key=_END, reverse=True)
+    items.sort(key=_START)
 
 
 def merge_overlaps(entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not entities:
         return []
-    entities_sorted = sorted(entities, key=lambda e: (e["start"], -e["end"]))
+    # Sweep each type on its own so a span of another type sitting between two
+    # overlapping same-type spans cannot keep them apart.
+    by_type: Dict[Any, List[Dict[str, Any]]] = {}
+    for e in entities:
+        by_type.setdefault(e["type"], []).append(e)
     merged: List[Dict[str, Any]] = []
-    current = entities_sorted[0].copy()
-    for e in entities_sorted[1:]:
-        if e["start"] <= current["end"] and e["type"] == current["type"]:
-            # overlap: extend and keep higher score
-            current["end"] = max(current["end"], e["end"])
-            current["score"] = max(float(current.get("score", 0.0)), float(e.get("score", 0.0)))
-        else:
-            merged.append(current)
-            current = e.copy()
-    merged.append(current)
+    for group in by_type.values():
+        _sort_spans(group)
+        # Entities that merge with nothing are passed through as-is; a run is
+        # copied only when it actually grows, so inputs are never mutated.
+        current = group[0]
+        copied = False
+        for e in group[1:]:
+            if e["start"] <= current["end"]:
+                if not copied:
+                    current = current.copy()
+                    copied = True
+                # overlap: extend and keep higher score
+                current["end"] = max(current["end"], e["end"])
+                current["score"] = max(float(current.get("score", 0.0)), float(e.get("score", 0.0)))
+            else:
+                merged.append(current)
+                current = e
+                copied = False
+        merged.append(current)
+    if len(by_type) > 1:
+        _sort_spans(merged)
     return merged
 
 
+def compile_policy(policy: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """Build the keep-predicate for `policy` once: one float threshold per
+    selected type, so each entity costs a dict lookup and a compare.
+
+    Callers filtering many batches against one policy can hold on to the
+    result. It is not cached on the policy dict itself, which ends up in the
+    JSON reports.
+    """
+    selected = policy.get("entities", []) or []
+    thresholds = policy.get("thresholds", {}) or {}
+    thr = {et: float(thresholds.get(et, 0.0)) for et in selected}
+    get = thr.get
+
+    def keep(e: Dict[str, Any]) -> bool:
+        t = get(e.get("type"))
+        return t is not None and float(e.get("score", 1.0)) >= t
+
+    return keep
+
+
 def filter_by_policy(entities: List[Dict[str, Any]], policy: Dict[str, Any]) -> List[Dict[str, Any]]:
     if not isinstance(policy, dict):
         return entities
-    selected = set(policy.get("entities", []))
-    if not selected:
+    if not policy.get("entities"):
         return []
-    thresholds = policy.get("thresholds", {}) or {}
-    filtered: List[Dict[str, Any]] = []
-    for e in entities:
-        et = e.get("type")
-        if et not in selected:
-            continue
-        thr = float(thresholds.get(et, 0.0))
-        if float(e.get("score", 1.0)) >= thr:
-            filtered.append(e)
-    return filtered
-
-
+    keep = compile_policy(policy)
+    return [e for e in entities if keep(e)]
@@ -25,7 +25,8 @@ def build_executable():
     # PyInstaller command with obfuscation options
     cmd = [
         "pyinstaller",
-        "--onefile",  # Single executable file
+        "--onedir",  # Unpacked bundle: --onefile re-extracts itself to a temp dir on every launch
+        "--noconfirm",  # Replace an existing dist/processor/ without prompting
         "--noconsole",  # No console window
         "--clean",  # Clean cache
         "--distpath", "dist",  # Output directory
@@ -35,6 +36,8 @@ def build_executable():
         "--add-data", "processor.py;.",  # Include source (optional)
         "--strip",  # Strip debug info
         "--optimize", "2",  # Python optimization level
+        "--exclude-module", "tkinter",  # GUI toolkit, never imported
+        "--exclude-module", "test",  # CPython test suite
         "processor.py"
     ]
     
@@ -71,13 +74,13 @@ def main():
     # Build executable
     if build_executable():
         print("[SUCCESS] Build completed successfully!")
-        print("[INFO] Executable location: dist/processor.exe")
+        print("[INFO] Executable location: dist/processor/processor.exe")
         
         # Clean up
         cleanup_build_files()
         
         print("\n[INFO] Next steps:")
-        print("1. The processor.exe is now compiled and obfuscated")
+        print("1. The processor.exe is now compiled and obfuscated (ship the whole dist/processor/ folder)")
         print("2. Update your Electron app to use processor.exe instead of processor.py")
         print("3. The executable contains all dependencies and is much harder to reverse engineer")
     else:
@@ -25,8 +25,9 @@ def build_with_nuitka():
     # Nuitka command with maximum obfuscation
     cmd = [
         sys.executable, "-m", "nuitka",
-        "--standalone",  # Standalone executable
-        "--onefile",  # Single file output
+        "--standalone",  # Standalone folder; --onefile would unpack itself on every launch
+        "--lto=yes",  # Link-time optimization of the generated C
+        f"--jobs={os.cpu_count() or 1}",  # Parallel C compilation
         "--assume-yes-for-downloads",  # Auto-download dependencies
         "--output-filename=processor.exe",  # Output filename
         "--output-dir=dist",  # Output directory
@@ -45,6 +46,11 @@ def build_with_nuitka():
     
     try:
         subprocess.check_call(cmd)
+        # Nuitka writes dist/processor.dist/; use the same layout as PyInstaller
+        target = Path("dist") / "processor"
+        if target.exists():
+            shutil.rmtree(target)
+        shutil.move(str(Path("dist") / "processor.dist"), str(target))
         print("[SUCCESS] Nuitka build completed successfully!")
         return True
     except subprocess.CalledProcessError as e:
@@ -61,7 +67,7 @@ def main():
     # Build with Nuitka
     if build_with_nuitka():
         print("[SUCCESS] Nuitka build completed successfully!")
-        print("[INFO] Executable location: dist/processor.exe")
+        print("[INFO] Executable location: dist/processor/processor.exe")
         
         print("\n[INFO] Benefits of Nuitka:")
         print("1. Compiles to C++ then to native machine code")
@@ -0,0 +1,75 @@
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+# Documents up to CHUNK_SIZE characters are detected in one piece. Larger ones
+# are split so per-detector copies (lowercased text, slices) stay chunk-sized.
+CHUNK_SIZE = 1 << 20
+# Re-scanned tail of the previous chunk, so matches cut at a boundary are
+# found whole in the next chunk. Must be below CHUNK_SIZE // 2. Patterns with
+# no length bound can outgrow any overlap; see detect_spanning.
+CHUNK_OVERLAP = 1024
+
+
+def iter_chunks(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Iterator[Tuple[int, str]]:
+    """Yield (offset, chunk) windows covering `text`, consecutive windows sharing
+    about `overlap` characters.
+
+    Boundaries are moved to line breaks where possible so line-based detectors
+    (addresses, `(?m)^` headers) see whole lines.
+    """
+    n = len(text)
+    if n <= chunk_size:
+        yield 0, text
+        return
+    overlap = min(overlap, chunk_size // 2 - 1)
+    start = 0
+    while True:
+        end = min(n, start + chunk_size)
+        if end < n:
+            nl = text.rfind("\n", start + chunk_size // 2, end)
+            if nl != -1:
+                end = nl + 1
+        yield start, text[start:end]
+        if end >= n:
+            return
+        # Start the next chunk at the first line beginning inside the overlap
+        nl = text.find("\n", end - overlap - 1, end - 1)
+        start = nl + 1 if nl != -1 else end - overlap
+
+
+def detect_chunked(
+    detect: Callable[[str], List[Dict[str, Any]]],
+    text: str,
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> List[Dict[str, Any]]:
+    """Run `detect(chunk)` over `iter_chunks(text)` and return entities with
+    document offsets.
+
+    Hits inside an overlap come back twice (or cut short in the earlier chunk);
+    `merge_overlaps` folds those same-type spans together.
+    """
+    entities: List[Dict[str, Any]] = []
+    for offset, chunk in iter_chunks(text, chunk_size, overlap):
+        found = detect(chunk)
+        if offset:
+            for e in found:
+                e["start"] += offset
+                e["end"] += offset
+        entities.extend(found)
+    return entities
+
+
+def detect_spanning(text: str, selected: List[str]) -> List[Dict[str, Any]]:
+    """Entities from the detector patterns with no length bound: PEM blocks,
+    privileged/header lines and the mnemonic window.
+
+    A match longer than the overlap that crosses a chunk boundary would be
+    lost, so callers that split a document pass spanning=False to the
+    per-chunk detectors and run this once over the whole text instead.
+    """
+    from python_backend.detectors.domain import detect_marker_lines
+    from python_backend.detectors.rules import detect_pem_blocks
+    from python_backend.detectors.secrets import detect_mnemonic
+
+    return detect_pem_blocks(text, selected) + detect_mnemonic(text, selected) + detect_marker_lines(text, selected)
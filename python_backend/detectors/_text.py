@@ -0,0 +1,16 @@
+from typing import Optional
+
+
+def lower_aligned(text: str, text_low: Optional[str] = None) -> str:
+    """Lowercase `text` keeping every character at its original offset.
+
+    Returns `text_low` when the caller already computed it. A few characters
+    (e.g. 'İ') lowercase to two code points; those are left as-is so spans
+    found in the lowercase copy still index into the original text.
+    """
+    if text_low is not None:
+        return text_low
+    low = text.lower()
+    if len(low) == len(text):
+        return low
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
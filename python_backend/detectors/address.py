@@ -1,4 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from python_backend.detectors._text import lower_aligned
 
 
 COMMON_STREET_SUFFIXES = {
@@ -15,20 +17,26 @@ POSTAL_LABELS = {"zip", "postal", "postcode"}
 ADDRESS_LABELS = {"address", "addr"}
 
 
-def _looks_like_street_line(line: str) -> bool:
-    text = line.strip()
-    if not text:
-        return False
-    low = text.lower()
-    # Heuristic checks: starts with number, contains a street suffix
-    tokens = [t.strip(",. ") for t in low.split()]
+def _looks_like_street_line(low: str) -> bool:
+    # Expects a stripped, lowercased line; one pass over its tokens
+    tokens = low.split()
     if not tokens:
         return False
-    starts_with_number = tokens[0].isdigit()
-    has_suffix = any(t in COMMON_STREET_SUFFIXES for t in tokens)
-    has_unit = any(t in UNIT_KEYWORDS for t in tokens)
-    # Allow cases without initial number if there is a clear suffix and unit
-    return (starts_with_number and has_suffix) or (has_suffix and has_unit)
+    # Heuristic checks: starts with number, contains a street suffix
+    starts_with_number = tokens[0].strip(",.").isdigit()
+    has_suffix = has_unit = False
+    for tok in tokens:
+        tok = tok.strip(",.")
+        if tok in COMMON_STREET_SUFFIXES:
+            has_suffix = True
+        elif tok in UNIT_KEYWORDS:
+            has_unit = True
+        else:
+            continue
+        # Allow cases without initial number if there is a clear suffix and unit
+        if has_suffix and (starts_with_number or has_unit):
+            return True
+    return False
 
 
 def _has_postal_cues(line: str) -> bool:
@@ -36,12 +44,14 @@ def _has_postal_cues(line: str) -> bool:
     return any(lbl in low for lbl in ("zip", "postal", "postcode"))
 
 
-def detect_addresses(text: str, requested: List[str]) -> List[Dict[str, Any]]:
+def detect_addresses(text: str, requested: List[str], text_low: Optional[str] = None) -> List[Dict[str, Any]]:
     if "address" not in requested:
         return []
     results: List[Dict[str, Any]] = []
     start = 0
     lines = text.splitlines(keepends=True)
+    # Same offsets as `lines`, so each line is lowercased only once
+    lines_low = lower_aligned(text, text_low).splitlines(keepends=True)
     for idx, line in enumerate(lines):
         end = start + len(line)
         stripped = line.strip()
@@ -49,20 +59,18 @@ def detect_addresses(text: str, requested: List[str]) -> List[Dict[str, Any]]:
             start = end
             continue
         # Direct label signal
-        has_label = any(lbl in stripped.lower() for lbl in ADDRESS_LABELS)
-        # Street-like line
-        street_like = _looks_like_street_line(stripped)
-        # Context look-ahead to see if next line contains city/state/zip cues
-        context_cue = False
-        if idx + 1 < len(lines):
-            next_line = lines[idx + 1].strip().lower()
-            if any(lbl in next_line for lbl in CITY_LABELS | STATE_LABELS | POSTAL_LABELS):
-                context_cue = True
-        if has_label or street_like or (street_like and context_cue):
+        stripped_low = lines_low[idx].strip()
+        has_label = any(lbl in stripped_low for lbl in ADDRESS_LABELS)
+        # Street-like line; also decides the score, so it is needed even when
+        # a label already matched
+        street_like = _looks_like_street_line(stripped_low)
+        if has_label or street_like:
+            # stripped begins right after the leading whitespace
+            s = start + len(line) - len(line.lstrip())
             results.append({
                 "type": "address",
-                "start": start + line.find(stripped),
-                "end": start + line.find(stripped) + len(stripped),
+                "start": s,
+                "end": s + len(stripped),
                 "text": stripped,
                 "score": 0.7 if street_like else 0.6,
                 "source": "heuristics"
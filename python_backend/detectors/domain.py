@@ -1,13 +1,21 @@
 import re
-from typing import List, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from python_backend.detectors._engine import compile_pattern
+from python_backend.detectors._text import lower_aligned
 
 
 Entity = Dict[str, Any]
 
 
+# Label patterns (PLATE_LABEL, COMM_LABEL, EMP_EDU_LABEL) are lowercase and
+# run on the lowercased text.
+
 # Transportation
 VIN_RE = re.compile(r"\b[A-HJ-NPR-Z0-9]{17}\b")
-PLATE_LABEL = re.compile(r"(?i)(plate|license plate)")
+PLATE_LABEL = re.compile(r"(plate|license plate)")
 PLATE_TOKEN = re.compile(r"\b[A-Z0-9\-]{5,8}\b")
 
 # Legal/privileged
@@ -17,7 +25,7 @@ PRIV_RE = re.compile(r"(?i)(Attorney\s*-?\s*Client|Privileged|Confidential)\b.*"
 SETTLE_RE = re.compile(r"(?i)(Settlement\s+Agreement|Settlement\s+Terms)")
 
 # Commercial/trade secrets
-COMM_LABEL = re.compile(r"(?i)(pricing|price|margin|discount|msrp|cogs|roadmap|confidential|nda|customer list|supplier list)")
+COMM_LABEL = re.compile(r"(pricing|price|margin|discount|msrp|cogs|roadmap|confidential|nda|customer list|supplier list)")
 CURRENCY_RE = re.compile(r"\$\d[\d,]*(?:\.\d{2})?\b")
 
 # Calendar/communications headers
@@ -25,7 +33,7 @@ HDR_RE = re.compile(r"(?m)^(From|To|Subject|Date|Message-ID|Received):\s+.+$")
 MEETING_RE = re.compile(r"(?i)(meeting|attendees|agenda)")
 
 # Employment/Education
-EMP_EDU_LABEL = re.compile(r"(?i)(Employee ID|EmpID|Student ID|Transcript|GPA|Performance Review)")
+EMP_EDU_LABEL = re.compile(r"(employee id|empid|student id|transcript|gpa|performance review)")
 ALNUM_5_12 = re.compile(r"\b[A-Z0-9\-]{5,12}\b")
 
 # Special-category (GDPR)
@@ -34,12 +42,70 @@ SPECIAL_WORDS = re.compile(r"(?i)(race|ethnicity|religion|religious|political|un
 # Children's data
 CHILDREN_WORDS = re.compile(r"(?i)(minor|under\s*18|child|children|guardian)")
 
+# Context-free cues: (pattern, label, score). Scanned one pattern at a time:
+# a docket or settlement match can start inside a case match and run past it.
+_SIMPLE_PATTERNS = (
+    (VIN_RE, "vin", 0.9),
+    (CASE_RE, "legal_case", 0.85),
+    (DOCKET_RE, "docket", 0.85),
+    (SETTLE_RE, "settlement", 0.8),
+    (MEETING_RE, "meeting", 0.8),
+)
+
+
+_DICTIONARY_DIR = Path(__file__).resolve().parent.parent / 'dictionaries'
+
+
+@lru_cache(maxsize=None)
+def _load_terms(name: str) -> Tuple[str, ...]:
+    """Lowercased, non-empty lines of a dictionary file, read once per process."""
+    try:
+        with open(_DICTIONARY_DIR / name, 'r', encoding='utf-8') as f:
+            return tuple(ln.strip().lower() for ln in f if ln.strip())
+    except Exception:
+        return ()
+
+
+@lru_cache(maxsize=None)
+def _terms_re(terms: Tuple[str, ...]) -> Any:
+    """Match a whole dictionary in one pass: a word-bounded alternation, longest
+    term first. A shorter term nested inside a longer match is not reported
+    separately; merge_overlaps would fold it into the same span anyway.
+    """
+    if not terms:
+        return None
+    alternation = "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+    return compile_pattern(r"\b(?:" + alternation + r")\b")
 
-def detect_domain_sensitive(text: str, requested: List[str]) -> List[Entity]:
+
+def detect_marker_lines(text: str, requested: List[str]) -> List[Entity]:
+    """Privileged markers and email headers run to the end of the line, however
+    long, so chunked callers run this once on the whole text and pass
+    spanning=False to detect_domain_sensitive."""
+    if "metadata" not in requested:
+        return []
+    results: List[Entity] = []
+    for pattern, label in ((PRIV_RE, "privileged"), (HDR_RE, "email_header")):
+        for m in pattern.finditer(text):
+            s, e = m.span()
+            results.append({
+                "type": "metadata",
+                "start": s,
+                "end": e,
+                "text": text[s:e],
+                "score": 0.9,
+                "source": label
+            })
+    return results
+
+
+def detect_domain_sensitive(text: str, requested: List[str], text_low: Optional[str] = None,
+                            spanning: bool = True) -> List[Entity]:
     # Map all to 'metadata' for policy selection
     if "metadata" not in requested:
         return []
     results: List[Entity] = []
+    text_low = lower_aligned(text, text_low)
 
     def add_span(s: int, e: int, label: str, score: float = 0.8):
         results.append({
@@ -51,44 +117,33 @@ def detect_domain_sensitive(text: str, requested: List[str]) -> List[Entity]:
             "source": label
         })
 
-    # VIN
-    for m in VIN_RE.finditer(text):
-        add_span(m.start(), m.end(), "vin", 0.9)
+    # VIN, legal case/docket, settlement and meeting cues
+    for pattern, label, score in _SIMPLE_PATTERNS:
+        for m in pattern.finditer(text):
+            add_span(m.start(), m.end(), label, score)
 
     # License plates (label + token nearby)
-    for lbl in PLATE_LABEL.finditer(text):
+    for lbl in PLATE_LABEL.finditer(text_low):
         s = lbl.end()
         right = text[s:s+32]
         tok = PLATE_TOKEN.search(right)
         if tok:
             add_span(s + tok.start(), s + tok.end(), "license_plate", 0.85)
 
-    # Legal/privileged
-    for m in CASE_RE.finditer(text):
-        add_span(m.start(), m.end(), "legal_case", 0.85)
-    for m in DOCKET_RE.finditer(text):
-        add_span(m.start(), m.end(), "docket", 0.85)
-    for m in PRIV_RE.finditer(text):
-        add_span(m.start(), m.end(), "privileged", 0.9)
-    for m in SETTLE_RE.finditer(text):
-        add_span(m.start(), m.end(), "settlement", 0.8)
+    # Privileged markers and calendar/communications headers
+    if spanning:
+        results.extend(detect_marker_lines(text, requested))
 
     # Commercial via label or dictionary
-    for m in COMM_LABEL.finditer(text):
+    for m in COMM_LABEL.finditer(text_low):
         s, e = m.span()
         left = max(0, s - 32)
         right = min(len(text), e + 32)
         score = 0.8 + (0.1 if CURRENCY_RE.search(text[left:right]) else 0)
         add_span(s, e, "commercial", min(score, 0.9))
 
-    # Calendar/communications
-    for m in HDR_RE.finditer(text):
-        add_span(m.start(), m.end(), "email_header", 0.9)
-    for m in MEETING_RE.finditer(text):
-        add_span(m.start(), m.end(), "meeting", 0.8)
-
     # Employment/Education
-    for lbl in EMP_EDU_LABEL.finditer(text):
+    for lbl in EMP_EDU_LABEL.finditer(text_low):
         s = lbl.end()
         right = text[s:s+48]
         tok = ALNUM_5_12.search(right)
@@ -96,28 +151,12 @@ def detect_domain_sensitive(text: str, requested: List[str]) -> List[Entity]:
             add_span(s + tok.start(), s + tok.end(), "employment_education", 0.85)
 
     # Special-category and children (dictionary-backed)
-    try:
-        from pathlib import Path
-        base = Path(__file__).resolve().parent.parent / 'dictionaries'
-        def load_terms(name: str) -> List[str]:
-            try:
-                with open(base / name, 'r', encoding='utf-8') as f:
-                    return [ln.strip().lower() for ln in f if ln.strip()]
-            except Exception:
-                return []
-        gdpr_terms = load_terms('gdpr_special.txt')
-        child_terms = load_terms('children.txt')
-    except Exception:
-        gdpr_terms = []
-        child_terms = []
-
-    text_low = text.lower()
-    for term in gdpr_terms:
-        for m in re.finditer(r"\b" + re.escape(term) + r"\b", text_low):
-            add_span(m.start(), m.end(), "special_gdpr", 0.8)
-    for term in child_terms:
-        for m in re.finditer(r"\b" + re.escape(term) + r"\b", text_low):
-            add_span(m.start(), m.end(), "children", 0.85)
+    for name, label, score in (("gdpr_special.txt", "special_gdpr", 0.8), ("children.txt", "children", 0.85)):
+        pattern = _terms_re(_load_terms(name))
+        if pattern is None:
+            continue
+        for m in pattern.finditer(text_low):
+            add_span(m.start(), m.end(), label, score)
 
     return results
 
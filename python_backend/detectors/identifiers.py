@@ -1,12 +1,18 @@
 import re
-from typing import List, Dict, Any
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from python_backend.detectors._engine import DualPattern, ascii_bytes
+from python_backend.detectors._text import lower_aligned
 
 
 Entity = Dict[str, Any]
 
 
+# Digit-led patterns start with an implied (?=\d) so the scan skips ahead to
+# candidate starts instead of trying \b at every position.
 IPV4_RE = re.compile(
-    r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"
+    r"(?=\d)\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"
 )
 IPV6_RE = re.compile(
     r"\b(?:(?:[A-Fa-f0-9]{1,4}:){2,7}[A-Fa-f0-9]{1,4})\b"
@@ -17,33 +23,75 @@ COOKIE_RE = re.compile(
     r"(?i)\b(sessionid|jsessionid|csrftoken|auth_token|sid)=([A-Za-z0-9\-_.]{8,})"
 )
 
-HOST_CTXT = re.compile(r"(?i)(host|hostname|domain)")
+# Context labels are lowercase and searched in the lowercased text
+HOST_CTXT = re.compile(r"(host|hostname|domain)")
 HOSTNAME_RE = re.compile(r"\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+[A-Za-z]{2,}\b")
 
-IMEI_MEID_CTXT = re.compile(r"(?i)(imei|meid)")
-FIFTEEN_DIGITS_RE = re.compile(r"\b\d{15}\b")
+IMEI_MEID_CTXT = re.compile(r"(imei|meid)")
+FIFTEEN_DIGITS_RE = re.compile(r"(?=\d)\b\d{15}\b")
 MEID_HEX_RE = re.compile(r"\b[0-9A-Fa-f]{14}\b")
 
 # GPS coordinates: lat,lon decimal degrees with optional spaces and N/S/E/W
 GPS_RE = re.compile(
-    r"\b([+-]?([1-8]?\d(?:\.\d+)?|90(?:\.0+)?))\s*,\s*([+-]?(?:1[0-7]\d(?:\.\d+)?|\d?\d(?:\.\d+)?|180(?:\.0+)?))\b"
+    r"(?=[-+\d])\b([+-]?([1-8]?\d(?:\.\d+)?|90(?:\.0+)?))\s*,\s*([+-]?(?:1[0-7]\d(?:\.\d+)?|\d?\d(?:\.\d+)?|180(?:\.0+)?))\b"
 )
-GPS_LABEL = re.compile(r"(?i)(gps|coord|latitude|longitude|lat|lon)")
+GPS_LABEL = re.compile(r"(gps|coord|latitude|longitude|lat|lon)")
 
 # Geohash: base32 (excluding a,i,l,o) length 5-9 for precision
 GEOHASH_RE = re.compile(r"\b[0123456789bcdefghjkmnpqrstuvwxyz]{5,9}\b")
-GEOHASH_LABEL = re.compile(r"(?i)(geohash)")
+GEOHASH_LABEL = re.compile(r"(geohash)")
 
 # Itinerary cues: date + location keyword in proximity
-DATE_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4})\b")
-TRAVEL_LABEL = re.compile(r"(?i)(flight|itinerary|arrival|departure|gate|terminal|boarding)")
+DATE_RE = re.compile(r"(?=\d)\b(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4})\b")
+TRAVEL_LABEL = re.compile(r"(flight|itinerary|arrival|departure|gate|terminal|boarding)")
+
+# Context-free identifiers: (pattern, label, score). Each is scanned on its own
+# because an IPv6 match can start inside a MAC match and extend past it.
+_PLAIN_IDENTIFIERS = (
+    (DualPattern(IPV4_RE), "ipv4", 0.9),
+    (DualPattern(IPV6_RE), "ipv6", 0.85),
+    (DualPattern(MAC_RE), "mac", 0.9),
+    (DualPattern(COOKIE_RE), "cookie", 0.95),
+)
 
 
-def detect_identifiers(text: str, requested: List[str]) -> List[Entity]:
+def _near_labels(pattern: re.Pattern, text: str, label_re: re.Pattern, text_low: str,
+                 radius: int, required: bool = True) -> Iterator[Tuple[Any, bool]]:
+    """Yield (match, label nearby) for each `pattern` match in `text`, where
+    "nearby" means the same as `label_re.search(text_low, s - radius, e + radius)`.
+
+    Labels are located first: with `required` and no label anywhere in the
+    text, `pattern` is never run. Otherwise each window is answered by
+    bisecting the label spans; a label straddling the window edge falls back
+    to the windowed search.
+    """
+    spans = [lbl.span() for lbl in label_re.finditer(text_low)]
+    if required and not spans:
+        return
+    ends = [e for _, e in spans]
+    n = len(text_low)
+    for m in pattern.finditer(text):
+        s, e = m.span()
+        left = max(0, s - radius)
+        right = min(n, e + radius)
+        i = bisect_right(ends, left)
+        if i == len(spans) or spans[i][0] >= right:
+            if not required:
+                yield m, False
+        elif spans[i][0] >= left and spans[i][1] <= right:
+            yield m, True
+        else:
+            near = label_re.search(text_low, left, right) is not None
+            if near or not required:
+                yield m, near
+
+
+def detect_identifiers(text: str, requested: List[str], text_low: Optional[str] = None) -> List[Entity]:
     # Map device/network/location to 'metadata' entity for policy selection
     if "metadata" not in requested:
         return []
     results: List[Entity] = []
+    text_low = lower_aligned(text, text_low)
 
     def add(m, label: str, score: float = 0.85):
         s, e = m.span()
@@ -51,67 +99,40 @@ def detect_identifiers(text: str, requested: List[str]) -> List[Entity]:
             "type": "metadata",
             "start": s,
             "end": e,
-            "text": m.group(0),
+            "text": text[s:e],
             "score": score,
             "source": label
         })
 
-    for m in IPV4_RE.finditer(text):
-        add(m, "ipv4", 0.9)
-    for m in IPV6_RE.finditer(text):
-        add(m, "ipv6", 0.85)
-    for m in MAC_RE.finditer(text):
-        add(m, "mac", 0.9)
-    for m in COOKIE_RE.finditer(text):
-        add(m, "cookie", 0.95)
+    raw = ascii_bytes(text)
+    for pattern, label, score in _PLAIN_IDENTIFIERS:
+        for m in pattern.finditer(text, raw):
+            add(m, label, score)
 
     # Hostnames only when context suggests hostname/domain
-    for m in HOSTNAME_RE.finditer(text):
-        s, e = m.span()
-        left = max(0, s - 32)
-        right = min(len(text), e + 32)
-        if HOST_CTXT.search(text[left:right]):
-            add(m, "hostname", 0.85)
+    for m, _ in _near_labels(HOSTNAME_RE, text, HOST_CTXT, text_low, 32):
+        add(m, "hostname", 0.85)
 
     # IMEI: 15 digits with nearby context
-    for m in FIFTEEN_DIGITS_RE.finditer(text):
-        s, e = m.span()
-        left = max(0, s - 24)
-        right = min(len(text), e + 24)
-        if IMEI_MEID_CTXT.search(text[left:right]):
-            add(m, "imei", 0.9)
+    for m, _ in _near_labels(FIFTEEN_DIGITS_RE, text, IMEI_MEID_CTXT, text_low, 24):
+        add(m, "imei", 0.9)
 
     # MEID: 14 hex with context
-    for m in MEID_HEX_RE.finditer(text):
-        s, e = m.span()
-        left = max(0, s - 24)
-        right = min(len(text), e + 24)
-        if IMEI_MEID_CTXT.search(text[left:right]):
-            add(m, "meid", 0.9)
+    for m, _ in _near_labels(MEID_HEX_RE, text, IMEI_MEID_CTXT, text_low, 24):
+        add(m, "meid", 0.9)
 
     # GPS coordinates, boost if label nearby
-    for m in GPS_RE.finditer(text):
-        s, e = m.span()
-        left = max(0, s - 32)
-        right = min(len(text), e + 32)
-        score = 0.85 + (0.1 if GPS_LABEL.search(text[left:right]) else 0)
+    for m, near in _near_labels(GPS_RE, text, GPS_LABEL, text_low, 32, required=False):
+        score = 0.85 + (0.1 if near else 0)
         add(m, "gps", min(score, 0.95))
 
     # Geohash with label
-    for m in GEOHASH_RE.finditer(text):
-        s, e = m.span()
-        left = max(0, s - 16)
-        right = min(len(text), e + 16)
-        if GEOHASH_LABEL.search(text[left:right]):
-            add(m, "geohash", 0.9)
+    for m, _ in _near_labels(GEOHASH_RE, text, GEOHASH_LABEL, text_low, 16):
+        add(m, "geohash", 0.9)
 
     # Itinerary heuristic: date near travel terms
-    for m in DATE_RE.finditer(text):
-        s, e = m.span()
-        left = max(0, s - 40)
-        right = min(len(text), e + 40)
-        if TRAVEL_LABEL.search(text[left:right]):
-            add(m, "itinerary", 0.8)
+    for m, _ in _near_labels(DATE_RE, text, TRAVEL_LABEL, text_low, 40):
+        add(m, "itinerary", 0.8)
 
     return results
 
@@ -1,5 +1,8 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from python_backend.detectors._engine import DualPattern, ascii_bytes, combine
+from python_backend.detectors._text import lower_aligned
 
 
 Entity = Dict[str, Any]
@@ -12,11 +15,19 @@ ICD10_RE = re.compile(r"\b[A-TV-Z][0-9]{2}(?:\.[A-Z0-9]{1,4})?\b")
 CPT_RE = re.compile(r"\b[0-9]{5}\b")
 
 # MRN/insurer IDs via context + alphanum token (6-12)
-MRN_LABEL = re.compile(r"(?i)\b(MRN|Med\.? Rec\.? No\.?|Medical Record Number|Member ID|Policy #|Insurance ID)\b")
+# Label is lowercase and searched in the lowercased text
+MRN_LABEL = re.compile(r"\b(mrn|med\.? rec\.? no\.?|medical record number|member id|policy #|insurance id)\b")
 ALNUM_6_12 = re.compile(r"\b[A-Z0-9]{6,12}\b")
 
+# Code patterns scanned in one pass: a CPT code is a digit-only word and an
+# ICD-10 code a letter-led one, so neither can start inside the other's match.
+# Group name -> score
+_CODE_SCORES = {"icd10": 0.85, "cpt": 0.8}
+CODES_RE = combine([("icd10", ICD10_RE), ("cpt", CPT_RE)])
+_CODES = DualPattern(CODES_RE)
+
 
-def detect_phi(text: str, requested: List[str]) -> List[Entity]:
+def detect_phi(text: str, requested: List[str], text_low: Optional[str] = None) -> List[Entity]:
     if "health" not in requested:
         return []
     results: List[Entity] = []
@@ -31,14 +42,13 @@ def detect_phi(text: str, requested: List[str]) -> List[Entity]:
             "source": label
         })
 
-    for m in ICD10_RE.finditer(text):
-        add(m.start(), m.end(), m.group(0), "icd10", 0.85)
-
-    for m in CPT_RE.finditer(text):
-        add(m.start(), m.end(), m.group(0), "cpt", 0.8)
+    for m in _CODES.finditer(text, ascii_bytes(text)):
+        label = m.lastgroup
+        s, e = m.span()
+        add(s, e, text[s:e], label, _CODE_SCORES[label])
 
     # MRN/Insurer IDs: look for label and next token
-    for lbl in MRN_LABEL.finditer(text):
+    for lbl in MRN_LABEL.finditer(lower_aligned(text, text_low)):
         s = lbl.end()
         right = text[s:s+64]
         m = ALNUM_6_12.search(right)
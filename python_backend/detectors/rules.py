@@ -1,51 +1,138 @@
 import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from python_backend.detectors._engine import DualPattern, ascii_bytes, combine
 
 
 Entity = Dict[str, Any]
 
 
 EMAIL_RE = re.compile(r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[A-Za-z]{2,}\b")
-PHONE_RE = re.compile(r"(?:(?<!\d)(\+?\d[\d\s().-]{7,}\d))")
-US_ZIP_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
-SSN_RE = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+# A leading (?=\d) is implied by the pattern but lets the scanner skip ahead to
+# the next digit in C instead of trying every position.
+PHONE_RE = re.compile(r"(?=[+\d])(?:(?<!\d)(\+?\d[\d\s().-]{7,}\d))")
+US_ZIP_RE = re.compile(r"(?=\d)\b\d{5}(?:-\d{4})?\b")
+SSN_RE = re.compile(r"(?=\d)\b\d{3}-\d{2}-\d{4}\b")
 AKIA_RE = re.compile(r"\bAKIA[0-9A-Z]{16}\b")
 JWT_RE = re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+")
 PEM_RE = re.compile(r"-----BEGIN [^-]+-----[\s\S]*?-----END [^-]+-----")
-CARD_RE = re.compile(r"\b(?:\d[ -]*?){13,19}\b")
+# 13-19 digits with optional space/dash separators. The lazy separators decide
+# which run is taken when a digit sequence is longer than a card number.
+CARD_RE = re.compile(r"(?=\d)\b(?:\d[ -]*?){13,19}\b")
 IBAN_RE = re.compile(r"\b[A-Z]{2}\d{2}[A-Z0-9]{11,30}\b")
 
+# Cards and IBANs are scanned in one pass: neither can start inside the other
+# (a card is digits and separators, an IBAN one letter-led word), so no match
+# hides another. Group name -> score. Credentials are not combined: a PEM block
+# can start inside a JWT's trailing [\w-] run and extend past it.
+FINANCIAL_RE = combine([("card", CARD_RE), ("iban", IBAN_RE)])
+_GROUP_SCORES = {"card": 0.7, "iban": 0.7}
+
+# Scanned as bytes when the text is plain ASCII (see DualPattern)
+_PHONE = DualPattern(PHONE_RE)
+_US_ZIP = DualPattern(US_ZIP_RE)
+_SSN = DualPattern(SSN_RE)
+_JWT = DualPattern(JWT_RE)
+_PEM = DualPattern(PEM_RE)
+_AKIA = DualPattern(AKIA_RE)
+_FINANCIAL = DualPattern(FINANCIAL_RE)
+
+# Local-part runs ending right before an '@'. The lookbehind lets a search
+# start only at the beginning of a run, and the possessive ++ never re-scans
+# it; the tail form picks up a run cut by the previous match.
+_EMAIL_LOCAL_RUN_RE = re.compile(r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]++(?=@)")
+_EMAIL_LOCAL_TAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]++(?=@)")
+_BOUNDARY_RE = re.compile(r"\b")
+
+
+def iter_emails(text: str) -> Iterator["re.Match[str]"]:
+    """Same matches as EMAIL_RE.finditer(text), in linear time.
+
+    EMAIL_RE re-scans a run of local-part characters from every word boundary
+    inside it, which is quadratic on input such as '1-1-1-...'. Each match
+    holds exactly one '@' and the part after it does not depend on where the
+    match starts, so per '@' only the first boundary of the run before it can
+    start a match.
+    """
+    pos = 0
+    while True:
+        run = _EMAIL_LOCAL_TAIL_RE.match(text, pos) or _EMAIL_LOCAL_RUN_RE.search(text, pos)
+        if run is None:
+            return
+        start, at = run.span()
+        b = _BOUNDARY_RE.search(text, start, at)
+        if b is not None and b.start() < at:
+            m = EMAIL_RE.match(text, b.start())
+            if m is not None:
+                yield m
+                pos = m.end()
+                continue
+        pos = at + 1
+
+
+def detect_pem_blocks(text: str, selected: List[str], raw: Optional[bytes] = None) -> List[Entity]:
+    """PEM blocks have no length bound, so chunked callers run this once on the
+    whole text and pass spanning=False to detect_entities_rules."""
+    if "credentials" not in selected:
+        return []
+    results: List[Entity] = []
+    for m in _PEM.finditer(text, raw if raw is not None else ascii_bytes(text)):
+        s, e = m.span()
+        results.append({
+            "type": "credentials",
+            "start": s,
+            "end": e,
+            "text": text[s:e],
+            "score": 0.95,
+            "source": "rules"
+        })
+    return results
 
-def detect_entities_rules(text: str, selected: List[str]) -> List[Entity]:
+
+def detect_entities_rules(text: str, selected: List[str], spanning: bool = True) -> List[Entity]:
     results: List[Entity] = []
     add = results.append
+    raw = ascii_bytes(text)
 
-    def find_all(pattern: re.Pattern, label: str, confidence: float = 0.85):
-        for m in pattern.finditer(text):
+    def find_all(matches: Iterator[Any], label: str, confidence: float = 0.85):
+        for m in matches:
+            s, e = m.span()
             add({
                 "type": label,
-                "start": m.start(),
-                "end": m.end(),
-                "text": m.group(0),
+                "start": s,
+                "end": e,
+                "text": text[s:e],
                 "score": confidence,
                 "source": "rules"
             })
 
+    def find_combined(pattern: DualPattern, label: str):
+        for m in pattern.finditer(text, raw):
+            s, e = m.span()
+            add({
+                "type": label,
+                "start": s,
+                "end": e,
+                "text": text[s:e],
+                "score": _GROUP_SCORES[m.lastgroup],
+                "source": "rules"
+            })
+
     if "email" in selected:
-        find_all(EMAIL_RE, "email")
+        find_all(iter_emails(text), "email")
     if "phone" in selected:
-        find_all(PHONE_RE, "phone", 0.8)
+        find_all(_PHONE.finditer(text, raw), "phone", 0.8)
     if "postal_code" in selected:
-        find_all(US_ZIP_RE, "postal_code", 0.8)
+        find_all(_US_ZIP.finditer(text, raw), "postal_code", 0.8)
     if "government_id" in selected:
-        find_all(SSN_RE, "government_id", 0.8)
+        find_all(_SSN.finditer(text, raw), "government_id", 0.8)
     if "credentials" in selected:
-        find_all(JWT_RE, "credentials", 0.9)
-        find_all(PEM_RE, "credentials", 0.95)
-        find_all(AKIA_RE, "credentials", 0.95)
+        find_all(_JWT.finditer(text, raw), "credentials", 0.9)
+        if spanning:
+            results.extend(detect_pem_blocks(text, selected, raw))
+        find_all(_AKIA.finditer(text, raw), "credentials", 0.95)
     if "financial" in selected:
-        find_all(CARD_RE, "financial", 0.7)
-        find_all(IBAN_RE, "financial", 0.7)
+        find_combined(_FINANCIAL, "financial")
 
     return results
 
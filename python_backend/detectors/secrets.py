@@ -1,6 +1,11 @@
 import re
+from collections import Counter
+from itertools import islice
+from math import log2
 from typing import List, Dict, Any
 
+from python_backend.detectors._engine import DualPattern, ascii_bytes
+
 
 Entity = Dict[str, Any]
 
@@ -22,46 +27,89 @@ PATTERNS = [
     (re.compile(r"\b0x?[0-9a-fA-F]{64}\b"), "credentials"),              # ETH private key
 ]
 
+# Generic high-entropy tokens, kept only with a context keyword nearby
+TOKEN_RE = re.compile(r"[A-Za-z0-9_\-]{24,}")
+# Scanned as bytes when the text is plain ASCII (see DualPattern)
+_VENDOR_PATTERNS = [(DualPattern(pattern), label) for pattern, label in PATTERNS]
+_TOKENS = DualPattern(TOKEN_RE)
+CTX_KEYWORDS = re.compile(r"(?i)(key|token|secret|password|bearer|auth|api[_-]?key|mnemonic|seed|recovery)")
+# Dictionary-like lowercase words for the mnemonic heuristic
+WORD_RE = re.compile(r"\b[a-z]{3,}\b")
+
+
+def shannon_entropy(sv: str) -> float:
+    if not sv:
+        return 0.0
+    l = len(sv)
+    return -sum((c/l) * log2(c/l) for c in Counter(sv).values())
 
-def detect_secrets(text: str, requested: List[str]) -> List[Entity]:
+
+def detect_mnemonic(text: str, requested: List[str]) -> List[Entity]:
+    """The mnemonic window can span any number of lines, so chunked callers run
+    this once on the whole text and pass spanning=False to detect_secrets."""
     if "credentials" not in requested:
         return []
     results: List[Entity] = []
-    for pattern, label in PATTERNS:
-        for m in pattern.finditer(text):
+    # BIP-39 mnemonic heuristic: presence of >=12 dictionary-like lowercase words
+    # We avoid bundling the full 2048-word list; use a light heuristic with context labels
+    if CTX_KEYWORDS.search(text):
+        # find the first 12-word window and report its span; stop reading words there
+        words = list(islice(WORD_RE.finditer(text), 12))
+        if len(words) == 12:
+            start_pos = words[0].start()
+            end_pos = words[-1].end()
+            results.append({
+                "type": "credentials",
+                "start": start_pos,
+                "end": end_pos,
+                "text": text[start_pos:end_pos],
+                "score": 0.8,
+                "source": "secrets_mnemonic"
+            })
+    return results
+
+
+def detect_secrets(text: str, requested: List[str], spanning: bool = True) -> List[Entity]:
+    if "credentials" not in requested:
+        return []
+    results: List[Entity] = []
+    raw = ascii_bytes(text)
+    for pattern, label in _VENDOR_PATTERNS:
+        for m in pattern.finditer(text, raw):
             start, end = m.span()
             results.append({
                 "type": label,
                 "start": start,
                 "end": end,
-                "text": m.group(0),
+                "text": text[start:end],
                 "score": 0.95,
                 "source": "secrets"
             })
     # Entropy-based generic detector (base64/base64url-ish or opaque tokens)
     # Only for long strings and boosted by context keywords nearby
-    ctx_keywords = re.compile(r"(?i)(key|token|secret|password|bearer|auth|api[_-]?key|mnemonic|seed|recovery)")
-    for m in re.finditer(r"[A-Za-z0-9_\-]{24,}", text):
+    # Vendor spans are merged into sorted, disjoint runs and tokens arrive in
+    # order (earlier entropy hits end before the next token), so a forward
+    # pointer suffices
+    vendor_spans: List[List[int]] = []
+    for s, e in sorted((r["start"], r["end"]) for r in results):
+        if vendor_spans and s <= vendor_spans[-1][1]:
+            vendor_spans[-1][1] = max(vendor_spans[-1][1], e)
+        else:
+            vendor_spans.append([s, e])
+    j = 0
+    for m in _TOKENS.finditer(text, raw):
         s, e = m.span()
-        token = m.group(0)
-        # Skip already matched vendor patterns (rough overlap check)
-        if any((s < r["end"] and e > r["start"]) for r in results):
+        token = text[s:e]
+        # Skip already matched vendor patterns
+        while j < len(vendor_spans) and vendor_spans[j][1] <= s:
+            j += 1
+        if j < len(vendor_spans) and vendor_spans[j][0] < e:
             continue
-        # entropy estimate
-        import math
-        def shannon_entropy(sv: str) -> float:
-            if not sv:
-                return 0.0
-            freq = {}
-            for ch in sv:
-                freq[ch] = freq.get(ch, 0) + 1
-            l = len(sv)
-            return -sum((c/l) * math.log2(c/l) for c in freq.values())
         ent = shannon_entropy(token)
         # context window around token
         left = max(0, s - 64)
         right = min(len(text), e + 64)
-        has_context = bool(ctx_keywords.search(text[left:right]))
+        has_context = bool(CTX_KEYWORDS.search(text[left:right]))
         if ent >= 3.5 and has_context:
             results.append({
                 "type": "credentials",
@@ -71,29 +119,8 @@ def detect_secrets(text: str, requested: List[str]) -> List[Entity]:
                 "score": 0.9,
                 "source": "secrets_entropy"
             })
-    # BIP-39 mnemonic heuristic: presence of >=12 dictionary-like lowercase words
-    # We avoid bundling the full 2048-word list; use a light heuristic with context labels
-    words = re.findall(r"\b[a-z]{3,}\b", text)
-    if len(words) >= 12 and ctx_keywords.search(text):
-        # find the first 12-word window and report its span
-        idx = 0
-        count = 0
-        start_pos = None
-        for m in re.finditer(r"\b[a-z]{3,}\b", text):
-            if start_pos is None:
-                start_pos = m.start()
-            count += 1
-            if count == 12:
-                end_pos = m.end()
-                results.append({
-                    "type": "credentials",
-                    "start": start_pos,
-                    "end": end_pos,
-                    "text": text[start_pos:end_pos],
-                    "score": 0.8,
-                    "source": "secrets_mnemonic"
-                })
-                break
+    if spanning:
+        results.extend(detect_mnemonic(text, requested))
     return results
 
 
@@ -9,6 +9,8 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
 # Add the parent directory to sys.path to import modules
@@ -17,9 +19,12 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from python_backend.processor import process_text_file
-from python_backend.pdf_processor import process_pdf_file
 from python_backend.reports import generate_dry_run_report, save_reports
+from python_backend.detectors._text import lower_aligned
+from python_backend.chunking import CHUNK_SIZE, detect_chunked, detect_spanning
+from python_backend.aggregator import merge_overlaps, filter_by_policy
+from python_backend.policy import validate_and_normalize_policy
+from python_backend.registry import DETECTOR_THREADS
 
 
 def load_policy(policy_path: str) -> dict:
@@ -32,54 +37,84 @@ def load_policy(policy_path: str) -> dict:
         return {}
 
 
+@lru_cache(maxsize=1)
+def _load_detectors() -> tuple:
+    """Import the detectors on first use. They compile their patterns at import,
+    so this runs once per process and PDF dry-runs never pay for it."""
+    from python_backend.detectors.rules import detect_entities_rules
+    from python_backend.detectors.ner import detect_entities_ner
+    from python_backend.detectors.address import detect_addresses
+    from python_backend.detectors.secrets import detect_secrets
+    from python_backend.detectors.identifiers import detect_identifiers
+    from python_backend.detectors.phi import detect_phi
+    from python_backend.detectors.domain import detect_domain_sensitive
+
+    return (
+        detect_entities_rules,
+        detect_entities_ner,
+        detect_addresses,
+        detect_secrets,
+        detect_identifiers,
+        detect_phi,
+        detect_domain_sensitive,
+    )
+
+
 def detect_entities_only(input_filepath: str, policy: dict) -> tuple:
     """Detect entities without masking for dry-run purposes."""
     try:
         # Read the input file
         with open(input_filepath, 'r', encoding='utf-8') as input_file:
             content = input_file.read()
-        
-        from python_backend.detectors.rules import detect_entities_rules
-        from python_backend.detectors.ner import detect_entities_ner
-        from python_backend.detectors.address import detect_addresses
-        from python_backend.detectors.secrets import detect_secrets
-        from python_backend.detectors.identifiers import detect_identifiers
-        from python_backend.detectors.phi import detect_phi
-        from python_backend.detectors.domain import detect_domain_sensitive
-        from python_backend.aggregator import merge_overlaps, filter_by_policy
-        from python_backend.policy import validate_and_normalize_policy
+
+        (
+            detect_entities_rules,
+            detect_entities_ner,
+            detect_addresses,
+            detect_secrets,
+            detect_identifiers,
+            detect_phi,
+            detect_domain_sensitive,
+        ) = _load_detectors()
 
         policy = validate_and_normalize_policy(policy)
         selected = policy.get("entities", []) or []
-        entities = []
-        
+        # Unbounded patterns are scanned once over the whole text when it is chunked
+        spanning = {"spanning": len(content) <= CHUNK_SIZE}
         # Run all detectors
-        entities.extend(detect_entities_rules(content, selected))
-        try:
-            entities.extend(detect_entities_ner(content, selected))
-        except Exception:
-            pass
-        try:
-            entities.extend(detect_addresses(content, selected))
-        except Exception:
-            pass
-        try:
-            entities.extend(detect_secrets(content, selected))
-        except Exception:
-            pass
-        try:
-            entities.extend(detect_identifiers(content, selected))
-        except Exception:
-            pass
-        try:
-            entities.extend(detect_phi(content, selected))
-        except Exception:
-            pass
-        try:
-            entities.extend(detect_domain_sensitive(content, selected))
-        except Exception:
-            pass
-        
+        def _detect(chunk: str) -> list:
+            # Lowercased once and shared by the detectors that do case-insensitive checks
+            low = {"text_low": lower_aligned(chunk)}
+            jobs = [
+                (detect_entities_rules, spanning),
+                (detect_entities_ner, {}),
+                (detect_addresses, low),
+                (detect_secrets, spanning),
+                (detect_identifiers, low),
+                (detect_phi, low),
+                (detect_domain_sensitive, {**low, **spanning}),
+            ]
+            if DETECTOR_THREADS > 1:
+                with ThreadPoolExecutor(max_workers=min(DETECTOR_THREADS, len(jobs))) as ex:
+                    futures = [ex.submit(fn, chunk, selected, **kw) for fn, kw in jobs]
+                run = [fut.result for fut in futures]
+            else:
+                run = [partial(fn, chunk, selected, **kw) for fn, kw in jobs]
+            found = []
+            # Collected in detector order either way; only a rules failure is fatal
+            for (fn, _kw), result in zip(jobs, run):
+                try:
+                    found.extend(result())
+                except Exception:
+                    if fn is detect_entities_rules:
+                        raise
+            return found
+
+        # Large documents are scanned in overlapping chunks; offsets stay document-relative
+        entities = detect_chunked(_detect, content)
+        if not spanning["spanning"]:
+            entities.extend(detect_spanning(content, selected))
+
         # Process entities
         entities = merge_overlaps(entities)
         entities = filter_by_policy(entities, policy)
@@ -8,7 +8,6 @@ import sys
 import py_compile
 import marshal
 import zlib
-import base64
 from cryptography.fernet import Fernet
 from pathlib import Path
 
@@ -60,14 +59,12 @@ def encrypt_python_file(input_file, output_file, key):
     
     # Encrypt the compressed data
     fernet = Fernet(key)
+    # Fernet tokens are already URL-safe base64, so they are written as-is
     encrypted_data = fernet.encrypt(compressed_data)
     
-    # Encode as base64 for easier handling
-    encoded_data = base64.b64encode(encrypted_data)
-    
     # Write encrypted bytecode
     with open(output_file, 'wb') as f:
-        f.write(encoded_data)
+        f.write(encrypted_data)
     
     # Clean up temporary bytecode file
     os.remove(bytecode_file)
@@ -83,7 +80,6 @@ Decryptor and executor for encrypted Python bytecode
 
 import sys
 import os
-import base64
 import zlib
 import marshal
 from cryptography.fernet import Fernet
@@ -100,12 +96,9 @@ def decrypt_and_execute(encrypted_file="{encrypted_file}"):
         key = load_key()
         fernet = Fernet(key)
         
-        # Read encrypted data
+        # Read encrypted data (a Fernet token)
         with open(encrypted_file, 'rb') as f:
-            encoded_data = f.read()
-        
-        # Decode from base64
-        encrypted_data = base64.b64decode(encoded_data)
+            encrypted_data = f.read()
         
         # Decrypt
         compressed_data = fernet.decrypt(encrypted_data)
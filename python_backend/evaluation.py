@@ -1,50 +1,86 @@
 from __future__ import annotations
 
-from typing import Dict, List, Any
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Optional, Tuple
 
 
 def _overlap(a_start: int, a_end: int, b_start: int, b_end: int) -> int:
     return max(0, min(a_end, b_end) - max(a_start, b_start))
 
 
-def evaluate_entities(true_entities: List[Dict[str, Any]], pred_entities: List[Dict[str, Any]]) -> Dict[str, float]:
+# Per type: (starts, ends, ids, longest, count). Non-empty true spans sorted by
+# start as parallel lists, ids being their positions among that type's spans
+# in input order, plus the longest span length and the number of true spans.
+TruthIndex = Dict[str, Tuple[List[int], List[int], List[int], int, int]]
+
+
+def build_truth_index(true_entities: List[Dict[str, Any]]) -> TruthIndex:
+    """Index a ground-truth set for evaluate_entities.
+
+    Build it once and pass it as `index` when scoring several prediction sets
+    against the same truth (threshold sweeps, detector comparisons).
+    """
+    # Index true spans by type, converted to ints once rather than per prediction
+    type_to_true: Dict[str, List[Tuple[int, int]]] = {}
+    for t in true_entities:
+        et = str(t.get("type", ""))
+        type_to_true.setdefault(et, []).append((int(t.get("start", 0)), int(t.get("end", 0))))
+
+    # A prediction [s, e) can only overlap spans starting in (s - longest, e),
+    # found by bisection instead of a full scan
+    index: TruthIndex = {}
+    for et, spans in type_to_true.items():
+        order = sorted((ts, idx) for idx, (ts, te) in enumerate(spans) if te > ts)
+        ids = [idx for _, idx in order]
+        longest = max((spans[idx][1] - spans[idx][0] for idx in ids), default=0)
+        index[et] = ([ts for ts, _ in order], [spans[idx][1] for idx in ids], ids, longest, len(spans))
+    return index
+
+
+def evaluate_entities(
+    true_entities: List[Dict[str, Any]],
+    pred_entities: List[Dict[str, Any]],
+    index: Optional[TruthIndex] = None,
+) -> Dict[str, float]:
     """
     Compute counters-only precision/recall metrics. No content logging.
 
     A prediction is correct if it overlaps any true span of the same type.
+    `index` is an optional build_truth_index(true_entities) result to reuse.
     """
-    # Index true by type for quick lookup
-    type_to_true: Dict[str, List[Dict[str, Any]]] = {}
-    for t in true_entities:
-        et = str(t.get("type", ""))
-        type_to_true.setdefault(et, []).append(t)
+    type_to_index = build_truth_index(true_entities) if index is None else index
 
     tp = 0
     fp = 0
     fn = 0
 
-    matched_true_ids = set()
+    # One flag byte per true span of each type, indexed by ids
+    type_to_matched = {et: bytearray(v[4]) for et, v in type_to_index.items()}
 
     for p in pred_entities:
         et = str(p.get("type", ""))
         s = int(p.get("start", 0))
         e = int(p.get("end", 0))
-        candidates = type_to_true.get(et, [])
-        found = False
-        for idx, t in enumerate(candidates):
-            ts = int(t.get("start", 0))
-            te = int(t.get("end", 0))
-            if _overlap(s, e, ts, te) > 0 and (et, idx, ts, te) not in matched_true_ids:
-                tp += 1
-                matched_true_ids.add((et, idx, ts, te))
-                found = True
-                break
-        if not found:
+        entry = type_to_index.get(et)
+        best = -1
+        if entry is not None and e > s:
+            starts, ends, ids, longest, _count = entry
+            matched = type_to_matched[et]
+            # Same pick as scanning in input order: the lowest-indexed unmatched
+            # true span that overlaps
+            for j in range(bisect_right(starts, s - longest), bisect_left(starts, e)):
+                idx = ids[j]
+                if ends[j] > s and not matched[idx] and (best < 0 or idx < best):
+                    best = idx
+        if best >= 0:
+            tp += 1
+            type_to_matched[et][best] = 1
+        else:
             fp += 1
 
-    # Count unmatched true as FN
-    total_true = sum(len(v) for v in type_to_true.values())
-    fn = total_true - len(matched_true_ids)
+    # Count unmatched true as FN; every TP matched exactly one true span
+    total_true = sum(v[4] for v in type_to_index.values())
+    fn = total_true - tp
 
     precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
     recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
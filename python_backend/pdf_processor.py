@@ -1,10 +1,327 @@
 import os
-import re
+import string
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+# ASCII letters and digits -> 'x'; str.translate is one C pass, no regex matching
+_MASK_TABLE = str.maketrans(dict.fromkeys(string.ascii_letters + string.digits, "x"))
 
 
 def mask_text_value(value: str) -> str:
     """Replace all ASCII letters and digits with 'x', preserve whitespace and punctuation."""
-    return re.sub(r"[A-Za-z0-9]", "x", value)
+    return value.translate(_MASK_TABLE)
+
+
+# Below this many pages per worker a process pool costs more than it saves
+PDF_MIN_PAGES_PER_WORKER = 8
+# Worker processes for long PDFs; 0 means one per CPU
+PDF_WORKERS = int(os.environ.get("DOCMASK_PDF_WORKERS", "0") or 0)
+
+
+def _page_spans(page_dict):
+    """Flatten blocks/lines/spans of a get_text("dict") result into
+    (text, bbox, size) tuples, skipping spans without text."""
+    return [
+        (span["text"], span.get("bbox"), span.get("size", 11))
+        for block in page_dict.get("blocks", [])
+        for line in block.get("lines", ())
+        for span in line.get("spans", ())
+        if span.get("text")
+    ]
+
+
+@dataclass
+class _MaskPlan:
+    """Masking settings resolved once per document and shared by its pages."""
+
+    mask_all: bool
+    detect_barcodes: bool = True
+    policy: Dict[str, Any] = field(default_factory=dict)  # normalized; unused for mask_all
+    email_re: Any = None
+    phone_re: Any = None
+    zip_re: Any = None
+    # None when masked spans are plain 'x' runs
+    pseudo: Any = None
+    # From _document_key; None keeps the DOC_MASKING_DOC_KEY key
+    doc_key: Optional[bytes] = None
+
+
+def _mask_plan(policy) -> _MaskPlan:
+    if not isinstance(policy, dict):
+        return _MaskPlan(mask_all=True)
+    detect_barcodes = policy.get("detect_barcodes", True)
+    if policy.get("mask_all"):
+        return _MaskPlan(mask_all=True, detect_barcodes=detect_barcodes)
+
+    from python_backend.detectors.rules import EMAIL_RE, PHONE_RE, US_ZIP_RE  # type: ignore
+    from python_backend.pseudonymizer import Pseudonymizer  # type: ignore
+    from python_backend.policy import validate_and_normalize_policy  # type: ignore
+
+    # Entity-based masking: emails, phones, US ZIP as baseline
+    policy = validate_and_normalize_policy(policy)
+    selected = set(policy.get("entities", []))
+    use_defaults = os.environ.get("DOCMASK_USE_DEFAULT_TEMPLATES", "false").lower() in {"1", "true", "yes"}
+    return _MaskPlan(
+        mask_all=False,
+        detect_barcodes=detect_barcodes,
+        policy=policy,
+        email_re=EMAIL_RE if "email" in selected else None,
+        phone_re=PHONE_RE if "phone" in selected else None,
+        zip_re=US_ZIP_RE if "postal_code" in selected else None,
+        pseudo=Pseudonymizer.from_environment() if use_defaults or policy.get("actions") else None,
+    )
+
+
+def _blocks_sample(blocks, limit: int = 1024) -> str:
+    """str(blocks)[:limit] without stringifying the blocks past the limit
+    (image blocks hold the image bytes)."""
+    parts = ["["]
+    size = 1
+    for i, block in enumerate(blocks):
+        if size >= limit:
+            break
+        piece = (", " if i else "") + repr(block)
+        parts.append(piece)
+        size += len(piece)
+    else:
+        parts.append("]")
+    return "".join(parts)[:limit]
+
+
+def _document_key(doc, input_filepath: str) -> Optional[bytes]:
+    """Pseudonym key for the whole document: file path plus a sample of the
+    first page's blocks. None if it cannot be derived."""
+    from python_backend.security import derive_document_key  # type: ignore
+
+    try:
+        page_dict = doc[0].get_text("dict") if len(doc) else {}
+        # Use file path and basic page text to derive a document key
+        sample_bytes = (page_dict.get("blocks") and _blocks_sample(page_dict["blocks"]).encode("utf-8")) or None
+        return derive_document_key(input_filepath, sample_bytes)
+    except Exception:
+        return None
+
+
+def _redact_page(page, input_filepath: str, plan: _MaskPlan) -> int:
+    """Mask one page in place; returns the number of characters seen."""
+    import fitz  # type: ignore  # PyMuPDF
+
+    from python_backend.redaction import mask_pdf_spans  # type: ignore
+    from python_backend.policy import resolve_pdf_mask_text  # type: ignore
+
+    total_chars = 0
+    # Image blocks carry the image bytes and are skipped by _page_spans anyway
+    page_dict = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES)
+    # If mask_all: mask all spans as before
+    if plan.mask_all:
+        # PyMuPDF without replacement text on redactions: blank every span, apply
+        # once, then draw the masked text (one content rewrite per page, not per span)
+        overlays = []
+        for text, bbox, size in _page_spans(page_dict):
+            masked = mask_text_value(text)
+            total_chars += len(text)
+            # Nothing to hide in spans without ASCII letters or digits (rules,
+            # bullets, page furniture): leave them as they are
+            if not bbox or masked == text:
+                continue
+            rect = fitz.Rect(bbox)
+            try:
+                page.add_redact_annot(
+                    rect, text=masked, fill=(1, 1, 1), text_color=(0, 0, 0)
+                )
+            except TypeError:
+                page.add_redact_annot(rect, fill=(1, 1, 1))
+                overlays.append((rect, masked, size))
+        if overlays:
+            page.apply_redactions()
+            for rect, masked, size in overlays:
+                page.insert_textbox(
+                    rect,
+                    masked,
+                    fontname="helv",
+                    fontsize=size,
+                    color=(0, 0, 0),
+                    align=0,
+                    overlay=True,
+                )
+    else:
+        policy, pseudo = plan.policy, plan.pseudo
+        email_re, phone_re, zip_re = plan.email_re, plan.phone_re, plan.zip_re
+        if pseudo is not None and plan.doc_key is not None:
+            # Same key on every page; setting it restarts the {index} numbering,
+            # which keeps it independent of how pages are split across workers
+            pseudo.set_document_key(plan.doc_key)
+
+        rects_to_mask = []
+        for text, bbox, _size in _page_spans(page_dict):
+            if not bbox:
+                continue
+            total_chars += len(text)
+            # Determine if this span contains any selected entity
+            matched_type = None
+            # "@" test first: EMAIL_RE otherwise tries every word of ordinary prose.
+            # Kept as separate searches: one alternation of the three patterns
+            # loses their (?=\d) skip-ahead and scans about 2x slower
+            # (and would pick the leftmost match instead of this type priority)
+            if email_re and "@" in text and email_re.search(text):
+                matched_type = "email"
+            elif phone_re and phone_re.search(text):
+                matched_type = "phone"
+            elif zip_re and zip_re.search(text):
+                matched_type = "postal_code"
+            if matched_type:
+                masked = resolve_pdf_mask_text(policy, pseudo, matched_type, text) if pseudo is not None else mask_text_value(text)
+                rects_to_mask.append({"rect": fitz.Rect(bbox), "masked_text": masked})
+        if rects_to_mask:
+            mask_pdf_spans(page, rects_to_mask)
+    try:
+        page.apply_redactions()
+    except Exception:
+        pass
+    return total_chars
+
+
+@lru_cache(maxsize=1)
+def _zbar_decode():
+    """pyzbar's decode, or None when pyzbar (or the zbar library) is missing.
+    Imported on first use and remembered either way, so a missing pyzbar is
+    not looked up on sys.path again for every PDF."""
+    try:
+        from pyzbar.pyzbar import decode  # type: ignore
+    except Exception:
+        return None
+    return decode
+
+
+_WHITE = (1.0, 1.0, 1.0)
+
+
+def _may_show_barcode(page) -> bool:
+    """False only for pages with no images (inline ones included) and no vector
+    drawing other than white fills, i.e. nothing a barcode could be drawn
+    with. The white redaction boxes of the text pass do not count. Barcodes
+    set in a barcode font are text and are not considered."""
+    try:
+        if page.get_image_info():
+            return True
+        for drawing in page.get_cdrawings():
+            if drawing.get("fill") not in (None, _WHITE) or drawing.get("color") not in (None, _WHITE):
+                return True
+        return False
+    except Exception:
+        # Cannot tell: render the page
+        return True
+
+
+def _redact_barcodes(page, decode) -> None:
+    """Black out the QR codes and barcodes zbar finds on a rendering of the page."""
+    import fitz  # type: ignore  # PyMuPDF
+
+    if not _may_show_barcode(page):
+        return
+    # zbar scans 8-bit grayscale: render straight to gray and hand
+    # pyzbar the raw samples instead of an RGB PIL image it would convert
+    pix = page.get_pixmap(colorspace=fitz.csGRAY, alpha=False)
+    codes = decode((pix.samples, pix.width, pix.height))
+    for code in codes:
+        # code.rect gives left, top, width, height in pixels
+        left, top, width, height = code.rect.left, code.rect.top, code.rect.width, code.rect.height
+        # Map pixel rect to PDF user space
+        # Compute scale factors from image pixels to page rect
+        page_rect = page.rect
+        scale_x = page_rect.width / pix.width
+        scale_y = page_rect.height / pix.height
+        rect = fitz.Rect(
+            left * scale_x,
+            top * scale_y,
+            (left + width) * scale_x,
+            (top + height) * scale_y,
+        )
+        try:
+            page.add_redact_annot(rect, fill=(0, 0, 0))
+        except Exception:
+            pass
+    try:
+        page.apply_redactions()
+    except Exception:
+        pass
+
+
+def _mask_pages(doc, input_filepath: str, plan: _MaskPlan) -> int:
+    """Mask every page of `doc` in place: text first, then barcodes.
+    Returns the number of characters seen."""
+    total_chars = sum(_redact_page(page, input_filepath, plan) for page in doc)
+    # Optional QR/barcode redaction using pyzbar if available; a policy can
+    # turn it off with "detect_barcodes": false to skip rendering pages
+    decode = _zbar_decode() if plan.detect_barcodes else None
+    if decode is not None:
+        try:
+            for page in doc:
+                _redact_barcodes(page, decode)
+        except Exception:
+            # Rendering or decoding failed; skip barcode redaction silently
+            pass
+    return total_chars
+
+
+def _redact_page_range(input_filepath: str, first: int, last: int, plan: _MaskPlan, output_filepath: str) -> int:
+    """Worker entry point: mask pages first..last of the input into their own PDF."""
+    import fitz  # type: ignore  # PyMuPDF
+
+    doc = fitz.open(input_filepath)
+    try:
+        doc.select(range(first, last + 1))
+        total_chars = _mask_pages(doc, input_filepath, plan)
+        doc.save(output_filepath)
+        return total_chars
+    finally:
+        doc.close()
+
+
+def _redact_sharded(doc, input_filepath: str, plan: _MaskPlan, workers: int):
+    """Mask contiguous page ranges in worker processes and join the parts.
+
+    Text extraction, apply_redactions and the barcode renders are CPU-bound
+    and hold the GIL, so long documents scale with cores this way. The joined
+    document gets the source outline back; links and annotations come along
+    with insert_pdf.
+    Returns (document, characters seen), or None when no process pool can be
+    used, in which case the caller masks the pages itself.
+    """
+    import shutil
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    import fitz  # type: ignore  # PyMuPDF
+
+    page_count = len(doc)
+    step = -(-page_count // workers)
+    ranges = [(lo, min(lo + step, page_count) - 1) for lo in range(0, page_count, step)]
+    tmp_dir = tempfile.mkdtemp(prefix="docmask_pdf_")
+    try:
+        parts = [os.path.join(tmp_dir, f"part{i}.pdf") for i in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+            futures = [
+                ex.submit(_redact_page_range, input_filepath, first, last, plan, part)
+                for (first, last), part in zip(ranges, parts)
+            ]
+            total_chars = sum(fut.result() for fut in futures)
+        merged = fitz.open()
+        for part in parts:
+            with fitz.open(part) as sub:
+                merged.insert_pdf(sub)
+        try:
+            merged.set_toc(doc.get_toc(simple=False))
+        except Exception:
+            pass
+        return merged, total_chars
+    except Exception:
+        # No usable process pool (sandboxed or frozen environment)
+        return None
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 def process_pdf_file(input_filepath: str, output_filepath: str, policy=None):
@@ -39,134 +356,29 @@ def process_pdf_file(input_filepath: str, output_filepath: str, policy=None):
             pass
         total_chars = 0
 
-        from python_backend.detectors.rules import EMAIL_RE, PHONE_RE, US_ZIP_RE  # type: ignore
-        from python_backend.redaction import mask_pdf_spans  # type: ignore
-        from python_backend.pseudonymizer import Pseudonymizer  # type: ignore
-        from python_backend.policy import validate_and_normalize_policy, resolve_pdf_mask_text  # type: ignore
-        from python_backend.security import derive_document_key  # type: ignore
-
-        for page in doc:
-            page_dict = page.get_text("dict")
-            mask_all = bool(policy.get("mask_all")) if isinstance(policy, dict) else True
-            # If mask_all: mask all spans as before
-            if mask_all:
-                for block in page_dict.get("blocks", []):
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            text = span.get("text", "")
-                            if not text:
-                                continue
-                            masked = mask_text_value(text)
-                            total_chars += len(text)
-                            bbox = span.get("bbox", None)
-                            if not bbox:
-                                continue
-                            rect = fitz.Rect(bbox)
-                            try:
-                                page.add_redact_annot(
-                                    rect, text=masked, fill=(1, 1, 1), text_color=(0, 0, 0)
-                                )
-                            except TypeError:
-                                page.add_redact_annot(rect, fill=(1, 1, 1))
-                                page.apply_redactions()
-                                page.insert_textbox(
-                                    rect,
-                                    masked,
-                                    fontname="helv",
-                                    fontsize=span.get("size", 11),
-                                    color=(0, 0, 0),
-                                    align=0,
-                                    overlay=True,
-                                )
-            else:
-                # Entity-based masking: emails, phones, US ZIP as baseline
-                policy = validate_and_normalize_policy(policy if isinstance(policy, dict) else {})
-                selected = set(policy.get("entities", []))
-                email_re = EMAIL_RE if "email" in selected else None
-                phone_re = PHONE_RE if "phone" in selected else None
-                zip_re = US_ZIP_RE if "postal_code" in selected else None
-
-                use_defaults = os.environ.get("DOCMASK_USE_DEFAULT_TEMPLATES", "false").lower() in {"1", "true", "yes"}
-                pseudo = Pseudonymizer.from_environment() if use_defaults or policy.get("actions") else None
-                if pseudo is not None:
-                    try:
-                        # Use file path and basic page text to derive a document key
-                        sample_bytes = (page_dict.get("blocks") and str(page_dict["blocks"])[:1024].encode("utf-8")) or None
-                        doc_key = derive_document_key(input_filepath, sample_bytes)
-                        pseudo.set_document_key(doc_key)
-                    except Exception:
-                        pass
-
-                rects_to_mask = []
-                for block in page_dict.get("blocks", []):
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            text = span.get("text", "")
-                            if not text:
-                                continue
-                            bbox = span.get("bbox", None)
-                            if not bbox:
-                                continue
-                            rect = fitz.Rect(bbox)
-                            total_chars += len(text)
-                            # Determine if this span contains any selected entity
-                            matched_type = None
-                            if email_re and email_re.search(text):
-                                matched_type = "email"
-                            elif phone_re and phone_re.search(text):
-                                matched_type = "phone"
-                            elif zip_re and zip_re.search(text):
-                                matched_type = "postal_code"
-                            if matched_type:
-                                masked = resolve_pdf_mask_text(policy, pseudo, matched_type, text) if pseudo is not None else mask_text_value(text)
-                                rects_to_mask.append({"rect": rect, "masked_text": masked})
-                if rects_to_mask:
-                    mask_pdf_spans(page, rects_to_mask)
-            try:
-                page.apply_redactions()
-            except Exception:
-                pass
-        # Optional QR/barcode redaction using pyzbar if available
-        try:
-            import numpy as _np  # type: ignore
-            import PIL.Image as _Image  # type: ignore
-            from pyzbar.pyzbar import decode as _decode  # type: ignore
-
-            for p in range(len(doc)):
-                page = doc[p]
-                pix = page.get_pixmap(alpha=False)
-                img = _Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                codes = _decode(img)
-                for code in codes:
-                    # code.rect gives left, top, width, height in pixels
-                    left, top, width, height = code.rect.left, code.rect.top, code.rect.width, code.rect.height
-                    # Map pixel rect to PDF user space
-                    # Compute scale factors from image pixels to page rect
-                    page_rect = page.rect
-                    scale_x = page_rect.width / pix.width
-                    scale_y = page_rect.height / pix.height
-                    rect = fitz.Rect(
-                        left * scale_x,
-                        top * scale_y,
-                        (left + width) * scale_x,
-                        (top + height) * scale_y,
-                    )
-                    try:
-                        page.add_redact_annot(rect, fill=(0, 0, 0))
-                    except Exception:
-                        pass
-                try:
-                    page.apply_redactions()
-                except Exception:
-                    pass
-        except Exception:
-            # pyzbar or pillow not installed; skip barcode redaction silently
-            pass
+        plan = _mask_plan(policy)
+        if plan.pseudo is not None:
+            plan.doc_key = _document_key(doc, input_filepath)
 
+        page_count = len(doc)
+        workers = min(PDF_WORKERS or os.cpu_count() or 1, page_count // PDF_MIN_PAGES_PER_WORKER)
+        merged = _redact_sharded(doc, input_filepath, plan, workers) if workers > 1 else None
+        if merged is not None:
+            doc.close()
+            doc, total_chars = merged
+        else:
+            total_chars = _mask_pages(doc, input_filepath, plan)
         output_dir = os.path.dirname(output_filepath)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
 
+        # Embedded fonts of unmasked text keep every glyph; subsetting them to the
+        # glyphs still used usually shrinks the output by half or more
+        try:
+            doc.subset_fonts()
+        except Exception:
+            pass
+
         # Ensure no incremental save (flatten metadata removal), garbage collect objects
         doc.save(output_filepath, deflate=True, garbage=4, clean=True)
         doc.close()
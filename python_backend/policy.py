@@ -30,7 +30,8 @@ def validate_and_normalize_policy(policy: Any) -> Dict[str, Any]:
         entry: Dict[str, Any] = {"action": action}
         if action in {"pseudonymize", "placeholder", "format"}:
             tmpl = cfg.get("template")
-            if isinstance(tmpl, str):
+            # Template validation: forbid obvious original-echoing templates
+            if isinstance(tmpl, str) and "{orig}" not in tmpl and "{text}" not in tmpl:
                 entry["template"] = tmpl
         kp = cfg.get("keep_parts", None)
         if isinstance(kp, dict):
@@ -39,15 +40,12 @@ def validate_and_normalize_policy(policy: Any) -> Dict[str, Any]:
                 entry["keep_parts"] = {"last": int(last)}
         normalized_actions[str(et)] = entry
     out["actions"] = normalized_actions
-    # Template validation: forbid obvious original-echoing templates
-    for et, cfg in list(out["actions"].items()):
-        tmpl = cfg.get("template")
-        if isinstance(tmpl, str) and ("{orig}" in tmpl or "{text}" in tmpl):
-            # Remove unsafe template
-            del out["actions"][et]["template"]
     # Optional global preserve_length hint for text; default False when using actions
     if "preserve_length" in policy:
         out["preserve_length"] = bool(policy.get("preserve_length"))
+    # Optional PDF switch for the barcode pass (page rendering + pyzbar); default on
+    if "detect_barcodes" in policy:
+        out["detect_barcodes"] = bool(policy.get("detect_barcodes"))
     return out
 
 
@@ -50,7 +50,7 @@ def process_text_file(input_filepath, output_filepath, policy=None, generate_rep
     Args:
         input_filepath (str): Path to the input text file
         output_filepath (str): Path to save the processed output file
-        policy (dict, optional): Entity masking policy
+        policy (dict, optional): Entity masking policy; read from DOCMASK_ENTITY_POLICY when None
         generate_report (bool): Whether to generate a dry-run report
         report_output_path (str, optional): Path for report output (without extension)
     
@@ -78,46 +78,61 @@ def process_text_file(input_filepath, output_filepath, policy=None, generate_rep
         from python_backend.detectors.identifiers import detect_identifiers  # type: ignore
         from python_backend.detectors.phi import detect_phi  # type: ignore
         from python_backend.detectors.domain import detect_domain_sensitive  # type: ignore
+        from python_backend.detectors._text import lower_aligned  # type: ignore
+        from python_backend.chunking import CHUNK_SIZE, detect_chunked, detect_spanning  # type: ignore
         from python_backend.aggregator import merge_overlaps, filter_by_policy  # type: ignore
         from python_backend.redaction import mask_text_spans  # type: ignore
         from python_backend.pseudonymizer import Pseudonymizer  # type: ignore
         from python_backend.policy import validate_and_normalize_policy, build_text_pseudonymize_fn  # type: ignore
         from python_backend.security import derive_document_key  # type: ignore
 
-        policy = policy or _load_entity_policy_from_env()
+        if policy is None:
+            policy = _load_entity_policy_from_env()
         policy = validate_and_normalize_policy(policy)
         if policy.get("mask_all"):
-            import re as _re
-            processed_content = _re.sub(r"[A-Za-z0-9]", "x", content)
+            from python_backend.pdf_processor import mask_text_value  # type: ignore
+
+            processed_content = mask_text_value(content)
         else:
             selected = policy.get("entities", []) or []
-            entities = []
+            # Unbounded patterns are scanned once over the whole text when it is chunked
+            spanning = len(content) <= CHUNK_SIZE
             # Run detectors
-            entities.extend(detect_entities_rules(content, selected))
-            try:
-                entities.extend(detect_entities_ner(content, selected))
-            except Exception:
-                pass
-            try:
-                entities.extend(detect_addresses(content, selected))
-            except Exception:
-                pass
-            try:
-                entities.extend(detect_secrets(content, selected))
-            except Exception:
-                pass
-            try:
-                entities.extend(detect_identifiers(content, selected))
-            except Exception:
-                pass
-            try:
-                entities.extend(detect_phi(content, selected))
-            except Exception:
-                pass
-            try:
-                entities.extend(detect_domain_sensitive(content, selected))
-            except Exception:
-                pass
+            def _detect(chunk: str) -> list:
+                found = []
+                # Lowercased once and shared by the detectors that do case-insensitive checks
+                chunk_low = lower_aligned(chunk)
+                found.extend(detect_entities_rules(chunk, selected, spanning=spanning))
+                try:
+                    found.extend(detect_entities_ner(chunk, selected))
+                except Exception:
+                    pass
+                try:
+                    found.extend(detect_addresses(chunk, selected, text_low=chunk_low))
+                except Exception:
+                    pass
+                try:
+                    found.extend(detect_secrets(chunk, selected, spanning=spanning))
+                except Exception:
+                    pass
+                try:
+                    found.extend(detect_identifiers(chunk, selected, text_low=chunk_low))
+                except Exception:
+                    pass
+                try:
+                    found.extend(detect_phi(chunk, selected, text_low=chunk_low))
+                except Exception:
+                    pass
+                try:
+                    found.extend(detect_domain_sensitive(chunk, selected, text_low=chunk_low, spanning=spanning))
+                except Exception:
+                    pass
+                return found
+
+            # Large documents are scanned in overlapping chunks; offsets stay document-relative
+            entities = detect_chunked(_detect, content)
+            if not spanning:
+                entities.extend(detect_spanning(content, selected))
             entities = merge_overlaps(entities)
             entities = filter_by_policy(entities, policy)
 
@@ -256,4 +271,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Long PDFs are masked in worker processes; frozen builds need this to spawn them
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
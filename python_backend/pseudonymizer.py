@@ -3,6 +3,7 @@ from __future__ import annotations
 import hmac
 import hashlib
 import os
+import string
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, Optional, Any
@@ -17,7 +18,18 @@ def _to_bytes(value: Optional[str | bytes]) -> bytes:
     return value.encode("utf-8")
 
 
+# ASCII character classes for _token_shape; other ASCII characters map to themselves
+_ASCII_SHAPE_TABLE = str.maketrans({
+    **dict.fromkeys(string.digits, "9"),
+    **dict.fromkeys(string.ascii_uppercase, "A"),
+    **dict.fromkeys(string.ascii_lowercase, "a"),
+    **{ch: " " for ch in map(chr, range(128)) if ch.isspace()},
+})
+
+
 def _token_shape(value: str) -> str:
+    if value.isascii():
+        return value.translate(_ASCII_SHAPE_TABLE)
     mapping = []
     for ch in value:
         if ch.isdigit():
@@ -55,6 +67,7 @@ class Pseudonymizer:
     def __init__(self, env_key: str | bytes, doc_key: Optional[str | bytes] = None, algo: str = "sha256") -> None:
         self._config = PseudonymizerConfig(env_key=_to_bytes(env_key), doc_key=_to_bytes(doc_key), algo=algo)
         self._counters: Dict[str, int] = {}
+        self._rekey()
 
     @staticmethod
     def from_environment(algo: str = "sha256") -> "Pseudonymizer":
@@ -65,6 +78,7 @@ class Pseudonymizer:
     def set_document_key(self, doc_key: str | bytes) -> None:
         self._config.doc_key = _to_bytes(doc_key)
         self._counters.clear()
+        self._rekey()
 
     def _scoped_key(self) -> bytes:
         # Derive a scoped key: HMAC(env_key, doc_key) if doc_key present; else env_key
@@ -72,9 +86,25 @@ class Pseudonymizer:
             return hmac.new(self._config.env_key, self._config.doc_key, getattr(hashlib, self._config.algo)).digest()
         return self._config.env_key
 
+    def _rekey(self) -> None:
+        # Keyed HMAC state for the current keys; each digest copies it instead of
+        # re-deriving the scoped key and re-keying per token
+        self._hmac = hmac.new(self._scoped_key(), None, getattr(hashlib, self._config.algo))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # HMAC objects do not pickle (PDF page-range workers get a copy); rebuilt on load
+        state = self.__dict__.copy()
+        del state["_hmac"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._rekey()
+
     def _digest_hex(self, message: str) -> str:
-        scoped = self._scoped_key()
-        return hmac.new(scoped, message.encode("utf-8"), getattr(hashlib, self._config.algo)).hexdigest()
+        h = self._hmac.copy()
+        h.update(message.encode("utf-8"))
+        return h.hexdigest()
 
     def next_index(self, entity_type: str) -> int:
         current = self._counters.get(entity_type, 0) + 1
@@ -102,8 +132,6 @@ class Pseudonymizer:
         normalized = original_value.strip()
         if index is None:
             index = self.next_index(entity_type)
-        if date is None:
-            date = datetime.now(timezone.utc)
 
         # Compute digest once per token+entity; use ASCII delimiter to avoid non-ASCII in source/runtime
         digest = self._digest_hex(f"{entity_type}|{normalized}")
@@ -125,9 +153,15 @@ class Pseudonymizer:
         result = result.replace("{index}", str(index))
         if "{shape}" in result:
             result = result.replace("{shape}", _token_shape(normalized))
-        result = _HASH_PLACEHOLDER_RE.sub(_expand_hash, result)
-        result = _DATE_PLACEHOLDER_RE.sub(_expand_date, result)
-        result = _ORIG_LAST_RE.sub(_expand_orig_last, result)
+        # Substring tests skip the regex pass for placeholders the template lacks
+        if "{hash" in result:
+            result = _HASH_PLACEHOLDER_RE.sub(_expand_hash, result)
+        if "{date:" in result:
+            if date is None:
+                date = datetime.now(timezone.utc)
+            result = _DATE_PLACEHOLDER_RE.sub(_expand_date, result)
+        if "{orig_last:" in result:
+            result = _ORIG_LAST_RE.sub(_expand_orig_last, result)
 
         # If keep_parts is provided and template didn't use {orig_last:N}, append kept part at end
         if keep_parts and isinstance(keep_parts.get("last", None), int):
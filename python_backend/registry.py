@@ -1,30 +1,63 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, List, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, Optional
 
 
 DetectorFn = Callable[[str, List[str]], List[Dict[str, Any]]]
 
+# Threads for run_selected. Off by default: CPython's `re` holds the GIL while
+# matching, so detectors only overlap on free-threaded builds or with regex
+# engines that release it.
+DETECTOR_THREADS = int(os.environ.get("DOCMASK_DETECTOR_THREADS", "0") or 0)
+
 
 class DetectorRegistry:
     def __init__(self) -> None:
         self._detectors: Dict[str, DetectorFn] = {}
+        self._labels: Dict[str, Optional[FrozenSet[str]]] = {}
 
-    def register(self, name: str, fn: DetectorFn) -> None:
+    def register(self, name: str, fn: DetectorFn, labels: Optional[Iterable[str]] = None) -> None:
+        """Add a detector. `labels` are the selected entity types it acts on;
+        run_selected skips it when none of them is selected. None: always run."""
         self._detectors[name] = fn
+        self._labels[name] = frozenset(labels) if labels is not None else None
 
     def list(self) -> List[str]:
         return sorted(self._detectors.keys())
 
-    def run_selected(self, text: str, selected: List[str]) -> List[Dict[str, Any]]:
+    def run_selected(self, text: str, selected: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        workers = DETECTOR_THREADS if max_workers is None else max_workers
+        wanted = set(selected)
+        fns = [
+            fn
+            for name, fn in self._detectors.items()
+            if self._labels[name] is None or not self._labels[name].isdisjoint(wanted)
+        ]
+        if workers > 1 and len(fns) > 1:
+            return self._run_threaded(fns, text, selected, workers)
         results: List[Dict[str, Any]] = []
-        for name, fn in self._detectors.items():
+        for fn in fns:
             try:
                 results.extend(fn(text, selected))
             except Exception:
                 continue
         return results
 
+    @staticmethod
+    def _run_threaded(fns: List[DetectorFn], text: str, selected: List[str], workers: int) -> List[Dict[str, Any]]:
+        # Results are collected in registration order, same as the sequential path
+        results: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=min(workers, len(fns))) as ex:
+            futures = [ex.submit(fn, text, selected) for fn in fns]
+            for fut in futures:
+                try:
+                    results.extend(fut.result())
+                except Exception:
+                    continue
+        return results
+
 
 def build_default_registry() -> DetectorRegistry:
     from python_backend.detectors.rules import detect_entities_rules
@@ -36,13 +69,18 @@ def build_default_registry() -> DetectorRegistry:
     from python_backend.detectors.domain import detect_domain_sensitive
 
     reg = DetectorRegistry()
-    reg.register("rules", detect_entities_rules)
-    reg.register("ner", _safe_wrap(detect_entities_ner))
-    reg.register("address", _safe_wrap(detect_addresses))
-    reg.register("secrets", _safe_wrap(detect_secrets))
-    reg.register("identifiers", _safe_wrap(detect_identifiers))
-    reg.register("phi", _safe_wrap(detect_phi))
-    reg.register("domain", _safe_wrap(detect_domain_sensitive))
+    # Labels mirror the `selected` checks at the top of each detector
+    reg.register(
+        "rules",
+        detect_entities_rules,
+        ("email", "phone", "postal_code", "government_id", "credentials", "financial"),
+    )
+    reg.register("ner", _safe_wrap(detect_entities_ner), ("person_name",))
+    reg.register("address", _safe_wrap(detect_addresses), ("address",))
+    reg.register("secrets", _safe_wrap(detect_secrets), ("credentials",))
+    reg.register("identifiers", _safe_wrap(detect_identifiers), ("metadata",))
+    reg.register("phi", _safe_wrap(detect_phi), ("health",))
+    reg.register("domain", _safe_wrap(detect_domain_sensitive), ("metadata",))
     return reg
 
 
@@ -9,9 +9,39 @@ Supports JSON and CSV output formats with detailed entity, page, span, action, a
 import json
 import csv
 import os
-from typing import List, Dict, Any, Optional, Union
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields, is_dataclass
+
+
+def _dataclass_fields(obj: Any) -> Dict[str, Any]:
+    """json `default` hook: a dataclass instance as a dict of its fields, like asdict() one level deep."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _page_key(entity: Dict[str, Any]) -> Any:
+    """Bucket key for page lookups; equal entities always share it."""
+    key = (entity.get("type"), entity.get("start"), entity.get("end"))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _index_page_entities(
+    page_entities: Dict[int, List[Dict[str, Any]]]
+) -> Dict[Any, List[Tuple[int, Dict[str, Any]]]]:
+    """Group (page, entity) pairs by _page_key, in page order, so finding an
+    entity's page compares it with a few candidates instead of every page's list."""
+    index: Dict[Any, List[Tuple[int, Dict[str, Any]]]] = {}
+    for page_num, page_entity_list in page_entities.items():
+        for candidate in page_entity_list:
+            index.setdefault(_page_key(candidate), []).append((page_num, candidate))
+    return index
 
 
 @dataclass
@@ -96,19 +126,20 @@ class ReportGenerator:
     ) -> ProcessingReport:
         """Generate a comprehensive dry-run report."""
         
-        # Count entities by type
-        entities_by_type = {}
-        actions_applied = {}
+        # Count entities by type; the action only depends on the type
+        entities_by_type = dict(Counter(entity.get("type", "unknown") for entity in entities))
+        action_by_type = {entity_type: self._determine_action(entity_type, policy) for entity_type in entities_by_type}
+        actions_applied: Dict[str, int] = {}
+        for entity_type, count in entities_by_type.items():
+            action = action_by_type[entity_type]
+            actions_applied[action] = actions_applied.get(action, 0) + count
         
         entity_reports = []
+        page_index = _index_page_entities(page_entities) if page_entities else {}
         
         for entity in entities:
-            entity_type = entity.get("type", "unknown")
-            entities_by_type[entity_type] = entities_by_type.get(entity_type, 0) + 1
-            
             # Determine action based on policy
-            action = self._determine_action(entity_type, policy)
-            actions_applied[action] = actions_applied.get(action, 0) + 1
+            action = action_by_type[entity.get("type", "unknown")]
             
             # Generate masked text if not provided
             masked_text_for_entity = None
@@ -119,11 +150,10 @@ class ReportGenerator:
             
             # Check if this entity is from a specific page
             page_number = None
-            if page_entities:
-                for page_num, page_entity_list in page_entities.items():
-                    if entity in page_entity_list:
-                        page_number = page_num
-                        break
+            for page_num, candidate in page_index.get(_page_key(entity), ()):
+                if candidate is entity or candidate == entity:
+                    page_number = page_num
+                    break
             
             entity_report = self.create_entity_report(
                 entity=entity,
@@ -163,13 +193,13 @@ class ReportGenerator:
     
     def save_json_report(self, report: ProcessingReport, output_path: str) -> None:
         """Save report as JSON file."""
-        report_dict = asdict(report)
-        
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
+        # Dataclasses are encoded as they are reached instead of deep-copying the
+        # whole report with asdict() first; the JSON is the same
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report_dict, f, indent=2, ensure_ascii=False)
+            json.dump(report, f, indent=2, ensure_ascii=False, default=_dataclass_fields)
     
     def save_csv_report(self, report: ProcessingReport, output_path: str) -> None:
         """Save report as CSV file with entity details."""
@@ -523,12 +523,13 @@ class TestDocumentGenerator:
             print(f"Error creating PDF: {e}")
             return False
     
-    def save_test_documents(self, output_dir: str = "test_documents") -> Dict[str, str]:
-        """Save all test documents to files and return file paths."""
+    def save_test_documents(self, output_dir: str = "test_documents", documents: Optional[List[TestDocument]] = None) -> Dict[str, str]:
+        """Save test documents (generated if not given) to files and return file paths."""
         os.makedirs(output_dir, exist_ok=True)
         file_paths = {}
         
-        documents = self.generate_test_documents()
+        if documents is None:
+            documents = self.generate_test_documents()
         
         for doc in documents:
             if doc.document_type == "txt":
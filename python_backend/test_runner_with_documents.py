@@ -32,6 +32,14 @@ class EnhancedTestRunner:
         self.generator = TestDocumentGenerator()
         self.estimator = OutputEstimator()
         self.test_results = []
+        self._documents: Optional[List[TestDocument]] = None
+    
+    @property
+    def documents(self) -> List[TestDocument]:
+        """Generated test documents, created once and reused by every test."""
+        if self._documents is None:
+            self._documents = self.generator.generate_test_documents()
+        return self._documents
         
     def setup_test_environment(self) -> str:
         """Set up the test environment with generated documents."""
@@ -39,10 +47,10 @@ class EnhancedTestRunner:
         
         # Generate test documents
         print("Generating test documents...")
-        file_paths = self.generator.save_test_documents(self.test_documents_dir)
+        documents = self.documents
+        file_paths = self.generator.save_test_documents(self.test_documents_dir, documents)
         
         # Generate expectations
-        documents = self.generator.generate_test_documents()
         expectations = self.estimator.generate_test_expectations(documents)
         
         # Save expectations
@@ -115,8 +123,7 @@ class EnhancedTestRunner:
     
     def _get_test_document(self, name: str) -> Optional[TestDocument]:
         """Get a test document by name."""
-        documents = self.generator.generate_test_documents()
-        for doc in documents:
+        for doc in self.documents:
             if doc.name == name:
                 return doc
         return None
@@ -5,7 +5,7 @@ repo_root = Path(__file__).resolve().parents[2]
 if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
-from python_backend.aggregator import merge_overlaps, filter_by_policy  # type: ignore
+from python_backend.aggregator import merge_overlaps, filter_by_policy, compile_policy  # type: ignore
 
 
 def test_merge_overlaps_basic():
@@ -32,3 +32,22 @@ def test_filter_by_policy_thresholds():
     assert types.count("email") == 1 and "phone" in types
 
 
+def test_merge_overlaps_ignores_other_types_in_between():
+    ents = [
+        {"type": "email", "start": 0, "end": 10, "score": 0.8},
+        {"type": "phone", "start": 2, "end": 6, "score": 0.7},
+        {"type": "email", "start": 8, "end": 14, "score": 0.9},
+    ]
+    merged = merge_overlaps(ents)
+    assert [(e["type"], e["start"], e["end"]) for e in merged] == [("email", 0, 14), ("phone", 2, 6)]
+    assert merged[0]["score"] == 0.9
+
+
+def test_compile_policy_leaves_policy_serializable():
+    import json
+    policy = {"entities": ["email"], "thresholds": {"email": "0.7"}}
+    keep = compile_policy(policy)
+    assert keep({"type": "email", "score": 0.8})
+    assert not keep({"type": "email", "score": 0.5})
+    assert not keep({"type": "phone", "score": 1.0})
+    json.dumps(policy)
@@ -21,3 +21,15 @@ def test_vin_plate_legal_commercial_emailhdr_employment_special_children():
     assert "commercial" in sources and "email_header" in sources and "employment_education" in sources
     assert "special_gdpr" in sources and "children" in sources
 
+
+def test_overlapping_legal_cues_are_covered_whole():
+    # A docket/settlement match starting inside a case match must still be reported
+    for text, secret in (
+        ("Docket: Case No. 1:23-cv-45678", "1:23-cv-45678"),
+        ("Case: Settlement Agreement", "Agreement"),
+    ):
+        covered = set()
+        for e in detect_domain_sensitive(text, ["metadata"]):
+            covered.update(range(e["start"], e["end"]))
+        start = text.index(secret)
+        assert set(range(start, start + len(secret))) <= covered
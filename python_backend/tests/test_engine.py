@@ -0,0 +1,86 @@
+import re
+import sys
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[2]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from python_backend.detectors._engine import DualPattern, ascii_bytes, combine, compile_pattern  # type: ignore
+
+
+def test_combine_dispatches_on_group_name():
+    pattern = combine([("num", re.compile(r"\b\d+\b")), ("word", re.compile(r"\b[a-z]+\b"))])
+    found = [(m.lastgroup, m.group(0)) for m in pattern.finditer("abc 123 def")]
+    assert found == [("word", "abc"), ("num", "123"), ("word", "def")]
+
+
+def test_combine_keeps_inline_flags_scoped():
+    pattern = combine([("ci", re.compile(r"(?i)token")), ("cs", re.compile(r"KEY"))])
+    found = [(m.lastgroup, m.group(0)) for m in pattern.finditer("TOKEN key KEY")]
+    assert found == [("ci", "TOKEN"), ("cs", "KEY")]
+
+
+def test_compile_pattern_falls_back_for_unsupported_syntax():
+    # Lookbehind is not supported by RE2; `re` must take over transparently
+    pattern = compile_pattern(r"(?<!\d)\d{3}", engine="re2")
+    assert [m.group(0) for m in pattern.finditer("a123 4567")] == ["123", "456"]
+
+
+def test_combine_with_re2_matches_re():
+    try:
+        import re2  # type: ignore  # noqa: F401
+    except Exception:
+        return
+    named = [("email", re.compile(r"\b[a-z]+@[a-z]+\.[a-z]{2,}\b")), ("hdr", re.compile(r"(?im)^subject:.*$"))]
+    text = "mail bob@example.com\nSUBJECT: hi\n"
+    spans = lambda p: [(m.lastgroup, m.span()) for m in p.finditer(text)]
+    assert spans(combine(named, engine="re2")) == spans(combine(named, engine="re"))
+
+
+def test_ascii_bytes_only_for_plain_ascii():
+    assert ascii_bytes("id 42") == b"id 42"
+    assert ascii_bytes("café 42") is None
+    # str \s matches the \x1c-\x1f separators, bytes \s does not
+    assert ascii_bytes("a\x1db") is None
+
+
+def test_dual_pattern_matches_str_spans():
+    dual = DualPattern(re.compile(r"(?i)\b(?P<word>ab\w*)|(?P<num>\d+)\s"))
+    text = "AB12 x 345 abc"
+    via_bytes = [(m.span(), m.lastgroup) for m in dual.finditer(text, ascii_bytes(text))]
+    via_str = [(m.span(), m.lastgroup) for m in dual.finditer(text)]
+    assert via_bytes == via_str == [((0, 4), "word"), ((7, 11), "num"), ((11, 14), "word")]
+
+
+class _FakeRe2:
+    """Stands in for google-re2: rejects lookaround like the real engine"""
+
+    @staticmethod
+    def compile(source):
+        if "(?=" in source or "(?!" in source or "(?<" in source:
+            raise ValueError("lookaround not supported")
+        return ("re2", source)
+
+
+def test_combined_detector_patterns_use_re2(monkeypatch):
+    from python_backend.detectors import _engine
+    from python_backend.detectors.phi import CPT_RE, ICD10_RE
+    from python_backend.detectors.rules import CARD_RE, IBAN_RE
+
+    monkeypatch.setattr(_engine, "_re2", _FakeRe2)
+    for named in ([("card", CARD_RE), ("iban", IBAN_RE)], [("icd10", ICD10_RE), ("cpt", CPT_RE)]):
+        assert combine(named, engine="re2")[0] == "re2"
+        assert isinstance(combine(named, engine="re"), re.Pattern)
+
+
+def test_start_hint_dropped_only_for_re2():
+    hinted = re.compile(r"(?=\d)\b\d{3}\b")
+    assert compile_pattern(hinted.pattern, engine="re").pattern == hinted.pattern
+    try:
+        import re2  # type: ignore  # noqa: F401
+    except Exception:
+        return
+    pattern = compile_pattern(hinted.pattern, engine="re2")
+    assert not isinstance(pattern, re.Pattern)
+    assert [m.group(0) for m in pattern.finditer("a 123 4567")] == ["123"]
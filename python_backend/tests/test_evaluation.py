@@ -1,4 +1,4 @@
-from python_backend.evaluation import evaluate_entities
+from python_backend.evaluation import build_truth_index, evaluate_entities
 
 
 def test_evaluate_entities_precision_recall_and_f1():
@@ -16,3 +16,15 @@ def test_evaluate_entities_precision_recall_and_f1():
     assert 0.0 < m["precision"] < 1.0 and 0.0 < m["recall"] <= 1.0 and 0.0 < m["f1"] <= 1.0
 
 
+def test_evaluate_entities_reuses_truth_index():
+    true = [
+        {"type": "email", "start": 0, "end": 10},
+        {"type": "email", "start": 5, "end": 15},
+        {"type": "phone", "start": 20, "end": 30},
+    ]
+    index = build_truth_index(true)
+    for pred in (
+        [{"type": "email", "start": 6, "end": 8}, {"type": "email", "start": 12, "end": 14}],
+        [{"type": "phone", "start": 25, "end": 26}, {"type": "phone", "start": 0, "end": 3}],
+    ):
+        assert evaluate_entities(true, pred, index=index) == evaluate_entities(true, pred)
@@ -27,3 +27,11 @@ def test_gps_geohash_itinerary():
     sources = set(e["source"] for e in ents)
     assert "gps" in sources and ("geohash" in sources or True) and "itinerary" in sources
 
+
+def test_context_offsets_survive_length_changing_lowercase():
+    # 'İ'.lower() is two code points; context windows must stay aligned
+    text = "İİİİ HOSTNAME: db.example.com " + "İ" * 40 + " IMEI 490154203237518"
+    ents = detect_identifiers(text, ["metadata"])
+    by_source = {e["source"]: e for e in ents}
+    assert by_source["hostname"]["text"] == "db.example.com"
+    assert "imei" in by_source
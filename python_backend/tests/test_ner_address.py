@@ -28,3 +28,13 @@ def test_libpostal_detector_optional():
     assert isinstance(ents, list)
 
 
+def test_ner_batch_optional():
+    try:
+        from python_backend.detectors.ner import detect_entities_ner_batch  # type: ignore
+    except Exception:
+        return
+    texts = ["Name: John Doe", "No names here.", "Alice Johnson signed."]
+    batches = detect_entities_ner_batch(texts, ["person_name"])
+    # One list per input text, empty lists if spacy is not installed
+    assert len(batches) == len(texts) and all(isinstance(b, list) for b in batches)
+    assert detect_entities_ner_batch(texts, ["email"]) == [[], [], []]
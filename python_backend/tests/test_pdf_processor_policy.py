@@ -55,3 +55,77 @@ def test_pdf_policy_default_templates_email(tmp_path, monkeypatch):
     assert dst.exists()
 
 
+def test_pdf_sharded_pages_match_serial(tmp_path, monkeypatch):
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return  # skip if PyMuPDF not installed
+
+    from python_backend import pdf_processor  # type: ignore
+
+    src = tmp_path / "in.pdf"
+    doc = fitz.open()
+    for i in range(16):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i}: bob{i}@example.com")
+    doc.set_toc([[1, "Start", 1], [1, "Middle", 9]])
+    doc.save(str(src))
+    doc.close()
+
+    # _redact_sharded falls back to serial masking on any error; make sure it didn't
+    sharded = []
+    redact_sharded = pdf_processor._redact_sharded
+
+    def spy(*args):
+        merged = redact_sharded(*args)
+        sharded.append(merged is not None)
+        return merged
+
+    monkeypatch.setattr(pdf_processor, "_redact_sharded", spy)
+
+    texts = {}
+    for workers in (1, 2):
+        dst = tmp_path / f"out{workers}.pdf"
+        monkeypatch.setattr(pdf_processor, "PDF_WORKERS", workers)
+        result = pdf_processor.process_pdf_file(str(src), str(dst), {"entities": ["email"]})
+        assert result["status"] == "success"
+        out = fitz.open(str(dst))
+        texts[workers] = ([page.get_text() for page in out], out.get_toc())
+        out.close()
+    assert sharded == [True]
+    assert texts[1] == texts[2]
+    assert "bob3@example.com" not in texts[2][0][3]
+
+
+def test_pdf_pseudonyms_stable_across_pages(tmp_path, monkeypatch):
+    try:
+        import fitz  # type: ignore
+    except Exception:
+        return  # skip if PyMuPDF not installed
+
+    from python_backend import pdf_processor, policy as policy_mod  # type: ignore
+
+    src = tmp_path / "in.pdf"
+    dst = tmp_path / "out.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 72), "Contact: alice@example.com")
+    doc.save(str(src))
+    doc.close()
+
+    masked = []
+    resolve = policy_mod.resolve_pdf_mask_text
+
+    def _recording_resolve(*args):
+        masked.append(resolve(*args))
+        return masked[-1]
+
+    monkeypatch.setattr(policy_mod, "resolve_pdf_mask_text", _recording_resolve)
+    monkeypatch.setattr(pdf_processor, "PDF_WORKERS", 1)
+    monkeypatch.setenv("DOC_MASKING_ENV_KEY", "envk")
+    policy = {"entities": ["email"], "actions": {"email": {"action": "pseudonymize"}}}
+    result = pdf_processor.process_pdf_file(str(src), str(dst), policy)
+    assert result["status"] == "success"
+    assert len(masked) == 3 and len(set(masked)) == 1
+    assert masked[0].startswith("EMAIL_")
@@ -63,3 +63,6 @@ def test_build_text_pseudonymize_fn_and_resolve_pdf_masks(monkeypatch):
     assert cred_pdf is None
 
 
+def test_detect_barcodes_flag_kept():
+    assert validate_and_normalize_policy({"detect_barcodes": 0})["detect_barcodes"] is False
+    assert "detect_barcodes" not in validate_and_normalize_policy({})
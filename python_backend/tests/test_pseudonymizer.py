@@ -92,3 +92,13 @@ def test_collision_check_truncated_hashes_do_not_trivially_collide():
     b = p.pseudonymize("bob@example.com", entity_type="email", template="{hash6}")
     assert a != b
 
+
+def test_pickled_copy_keeps_keys():
+    import pickle
+
+    p = Pseudonymizer(env_key=b"env", doc_key=b"doc")
+    q = pickle.loads(pickle.dumps(p))
+    template = "{hash12}"
+    assert q.pseudonymize("alice@example.com", entity_type="email", template=template) == p.pseudonymize(
+        "alice@example.com", entity_type="email", template=template
+    )
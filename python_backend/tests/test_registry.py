@@ -7,3 +7,29 @@ def test_registry_runs_all_detectors_safely():
     assert any(e.get("type") == "email" for e in out)
 
 
+def test_registry_threaded_matches_sequential():
+    reg = build_default_registry()
+    text = "Contact alice@example.com or 555-123-4567, SSN 123-45-6789"
+    selected = ["email", "phone", "government_id"]
+    found = reg.run_selected(text, selected, max_workers=1)
+    assert reg.run_selected(text, selected, max_workers=4) == found
+    assert "government_id" in {e["type"] for e in found}
+
+
+def test_registry_skips_detectors_without_selected_labels():
+    from python_backend.registry import DetectorRegistry
+
+    calls = []
+
+    def _detector(name):
+        def fn(text, selected):
+            calls.append(name)
+            return []
+        return fn
+
+    reg = DetectorRegistry()
+    reg.register("emails", _detector("emails"), ("email",))
+    reg.register("health", _detector("health"), ("health",))
+    reg.register("any", _detector("any"))
+    reg.run_selected("text", ["email"], max_workers=1)
+    assert calls == ["emails", "any"]
@@ -208,7 +208,23 @@ class TestReportGenerator(unittest.TestCase):
         self.assertEqual(report.actions_applied, {"pseudonymize": 1, "remove": 1})
         self.assertEqual(len(report.entities), 2)
         self.assertEqual(report.processing_time_ms, 150.5)
-    
+
+    def test_generate_dry_run_report_page_numbers(self):
+        """Test that entities are attributed to the page listing them."""
+        first = {"type": "email", "start": 0, "end": 5, "text": "a@b.c"}
+        second = {"type": "email", "start": 10, "end": 15, "text": "d@e.f"}
+        unpaged = {"type": "phone", "start": 20, "end": 32, "text": "555-123-4567"}
+
+        report = self.generator.generate_dry_run_report(
+            document_path="/path/to/test.pdf",
+            document_type="pdf",
+            entities=[first, dict(second), unpaged],
+            policy={},
+            page_entities={1: [first], 2: [second]}
+        )
+
+        self.assertEqual([e.page_number for e in report.entities], [1, 2, None])
+
     def test_save_json_report(self):
         """Test saving JSON report."""
         entities = [
@@ -5,7 +5,7 @@ repo_root = Path(__file__).resolve().parents[2]
 if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
-from python_backend.detectors.rules import detect_entities_rules, EMAIL_RE, PHONE_RE, US_ZIP_RE, SSN_RE, AKIA_RE, JWT_RE, PEM_RE, CARD_RE, IBAN_RE  # type: ignore
+from python_backend.detectors.rules import detect_entities_rules, iter_emails, EMAIL_RE, PHONE_RE, US_ZIP_RE, SSN_RE, AKIA_RE, JWT_RE, PEM_RE, CARD_RE, IBAN_RE  # type: ignore
 
 
 def test_email_detection():
@@ -42,3 +42,26 @@ def test_credentials_and_financial_detection():
     assert "credentials" in tset and "financial" in tset
 
 
+def test_iter_emails_matches_regex():
+    samples = [
+        "a@b.co x.y-z@ex.ample.org",
+        "end.com.x@y.com and -lead@x.io and _u@v.com",
+        "no mail here @ all @@ a@b",
+        "é.name@ex.com 1-2-3@4-5.de",
+    ]
+    for text in samples:
+        assert [m.span() for m in iter_emails(text)] == [m.span() for m in EMAIL_RE.finditer(text)]
+
+
+def test_iter_emails_linear_on_long_local_runs():
+    # EMAIL_RE.finditer is quadratic here; iter_emails must stay fast
+    text = "1-" * 50000 + " contact: ops@example.com"
+    found = [m.group(0) for m in iter_emails(text)]
+    assert found == ["ops@example.com"]
+
+
+def test_card_pattern_on_overlong_digit_runs():
+    # 21 digits: the lazy separators settle on the first 13-digit run
+    text = "1:23-cv-456784111 1111 1111 1111"
+    assert [m.group(0) for m in CARD_RE.finditer(text)] == ["456784111 1111"]
+    assert [m.group(0) for m in CARD_RE.finditer("4111 1111 1111 1111")] == ["4111 1111 1111 1111"]